@@ -2,6 +2,8 @@
 """
 User-configurable variables - modify as needed
 """
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
 import os
 import getpass
 
@@ -27,135 +29,608 @@ COMPANY_DOMAIN = os.getenv('COMPANY_DOMAIN', 'example.com')
 # Copyright: (c) 2023, Your Name <your.email@example.com>
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-from __future__ import (absolute_import, division, print_function)
-__metaclass__ = type
-
 DOCUMENTATION = r'''
 ---
 module: podman_image_info
 short_description: Gather information about Podman images
 description:
- - Gather information about Podman images.
- - Lists images and their attributes.
+  - Gather information about Podman images.
+  - Lists images and their attributes.
+  - Filters are passed to C(podman images --filter) so that podman does the
+    selection, and I(fields) trims each image before the result is returned.
 options:
- name:
- description:
- - Filter by image name.
- type: str
- required: false
- tag:
- description:
- - Filter by image tag.
- type: str
- required: false
+  name:
+    description:
+      - Filter by image name.
+    type: str
+    required: false
+  tag:
+    description:
+      - Filter by image tag.
+      - Combined with I(name) when given, otherwise matches the tag on any image.
+    type: str
+    required: false
+  dangling:
+    description:
+      - Only untagged images when true, only tagged images when false.
+    type: bool
+    required: false
+  before:
+    description:
+      - Only images created before this image (name or ID).
+    type: str
+    required: false
+  since:
+    description:
+      - Only images created after this image (name or ID).
+    type: str
+    required: false
+  label:
+    description:
+      - Only images with these labels, each C(key) or C(key=value).
+    type: list
+    elements: str
+    required: false
+  reference:
+    description:
+      - Only images whose reference matches one of these patterns, for example C(registry.example.com/*).
+    type: list
+    elements: str
+    required: false
+  fields:
+    description:
+      - Keys to keep in each returned image, matched case-insensitively against the
+        keys podman reports (for example C(Id), C(Names), C(Created), C(Size)).
+      - All keys are returned when omitted.
+      - Applied after I(details), so inspect keys such as C(Architecture) can be selected too.
+    type: list
+    elements: str
+    required: false
+  details:
+    description:
+      - Merge C(podman image inspect) data (digests, layers, labels, architecture and so on)
+        into each image.
+      - The selected images are inspected a batch at a time rather than one call per image.
+        Keys already reported by C(podman images) keep their listing values.
+    type: bool
+    default: false
+  batch_size:
+    description:
+      - Maximum number of images passed to one C(podman image inspect) call when I(details) is true.
+    type: int
+    default: 200
+  backend:
+    description:
+      - How to talk to podman. C(api) uses the libpod REST API over its unix socket on one
+        persistent connection, C(cli) runs the C(podman) command for every query.
+      - C(auto) uses the API when the socket answers and falls back to the command otherwise.
+      - The two backends report the same information, but a few keys differ between
+        C(podman images --format json) and the API (for example the API has no C(CreatedAt)).
+    type: str
+    choices: [auto, api, cli]
+    default: auto
+  socket_path:
+    description:
+      - Path of the podman API socket.
+      - Defaults to C(CONTAINER_HOST) when it is a C(unix://) URL, then
+        C($XDG_RUNTIME_DIR/podman/podman.sock) for rootless users, then C(/run/podman/podman.sock).
+    type: path
+    required: false
+  cache:
+    description:
+      - Reuse the result of an identical earlier query while the image store is unchanged.
+        Results of the API and of the command are cached separately, as their keys differ.
+      - The store is fingerprinted from the modification times of its image and container
+        databases under I(storage_root). When those are not readable, a I(details) query
+        digests the sorted image and container IDs (with image names) instead, which costs
+        two cheap queries; a query without I(details) costs no more than that, so it is not cached.
+    type: bool
+    default: false
+  cache_dir:
+    description:
+      - Directory of the cached results.
+      - Defaults to C($XDG_CACHE_HOME/podman_image_info), or C(~/.cache/podman_image_info).
+    type: path
+    required: false
+  storage_root:
+    description:
+      - Podman storage root (C(graphroot)) whose databases fingerprint the image store.
+      - Defaults to C(/var/lib/containers/storage) for root and
+        C($XDG_DATA_HOME/containers/storage) (or C(~/.local/share/containers/storage)) otherwise.
+    type: path
+    required: false
 author:
- - "Your Name (@yourGitHubHandle)"
+  - "Your Name (@yourGitHubHandle)"
 '''
 
 EXAMPLES = r'''
 - name: Get info about all images
- podman_image_info:
- register: image_info
+  podman_image_info:
+  register: image_info
 
 - name: Get info about a specific image
- podman_image_info:
- name: registry.${COMPANY_NAME}.io/ansible-automation-platform-25/ee-minimal-rhel8
- register: specific_image_info
+  podman_image_info:
+    name: registry.${COMPANY_NAME}.io/ansible-automation-platform-25/ee-minimal-rhel8
+  register: specific_image_info
+
+- name: Get the ID and size of every dangling image
+  podman_image_info:
+    dangling: true
+    fields:
+      - Id
+      - Size
+  register: dangling_images
+
+- name: Get images from one registry carrying a label
+  podman_image_info:
+    reference:
+      - "registry.${COMPANY_DOMAIN}/*"
+    label:
+      - com.redhat.component
+    since: ubi9/ubi-minimal:latest
+  register: labelled_images
+
+- name: Get the architecture and layers of every image from a registry
+  podman_image_info:
+    reference:
+      - "registry.${COMPANY_DOMAIN}/*"
+    details: true
+    fields:
+      - Id
+      - Names
+      - Architecture
+      - RootFS
+  register: image_details
+
+- name: List images, reusing the last result while the image store is unchanged
+  podman_image_info:
+    cache: true
+  register: image_info
 '''
 
 RETURN = r'''
 images:
- description: List of image dictionaries
- returned: always
- type: list
- elements: dict
- contains:
- id:
- description: Image ID
- type: str
- sample: "sha256:f9a9f253f6798722d9e692c2b1429aa1"
- names:
- description: Image names and tags
- type: list
- sample: ["registry.${COMPANY_NAME}.io/ansible-automation-platform-25/ee-minimal-rhel8:latest"]
- created:
- description: When the image was created
- type: str
- sample: "2023-04-20T10:15:30Z"
- size:
- description: Image size in bytes
- type: int
- sample: 358974135
+  description: List of image dictionaries
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    id:
+      description: Image ID
+      type: str
+      sample: "sha256:f9a9f253f6798722d9e692c2b1429aa1"
+    names:
+      description: Image names and tags
+      type: list
+      sample: ["registry.${COMPANY_NAME}.io/ansible-automation-platform-25/ee-minimal-rhel8:latest"]
+    created:
+      description: When the image was created
+      type: str
+      sample: "2023-04-20T10:15:30Z"
+    size:
+      description: Image size in bytes
+      type: int
+      sample: 358974135
+count:
+  description: Number of images returned
+  returned: always
+  type: int
+  sample: 12
+cache_hit:
+  description: Whether the images came from the cache
+  returned: always
+  type: bool
+  sample: false
+backend:
+  description: Backend that answered the queries, C(api) or C(cli), or C(cache) on a cache hit
+  returned: always
+  type: str
+  sample: api
+elapsed:
+  description: Seconds spent gathering the images
+  returned: always
+  type: float
+  sample: 0.31
 '''
 
+import glob
+import hashlib
+import http.client
 import json
 import re
+import socket
 import subprocess
+import time
+from urllib.parse import quote, urlencode
 
 from ansible.module_utils.basic import AnsibleModule
 
 
+API_VERSION = "v4.0.0"
+API_TIMEOUT = 30
+
+
+class PodmanAPIError(Exception):
+    """The podman API socket could not be reached or returned an error."""
+
+
 def run_command(module, command):
- """Run a Podman command and return the output."""
- try:
- result = subprocess.run(
- command,
- stdout=subprocess.PIPE,
- stderr=subprocess.PIPE,
- check=False,
- universal_newlines=True
- )
- if result.returncode != 0:
- module.fail_json(
- msg="Failed to execute command",
- command=command,
- stdout=result.stdout,
- stderr=result.stderr,
- rc=result.returncode
- )
- return result.stdout
- except Exception as e:
- module.fail_json(msg=f"Command execution error: {e}", command=command)
-
-
-def get_image_info(module, name=None, tag=None):
- """Get image information using podman images."""
- command = ["podman", "images", "--format", "json"]
- 
- if name:
- command.append(name)
- if tag:
- command[-1] = f"{name}:{tag}"
- 
- output = run_command(module, command)
- 
- try:
- return json.loads(output)
- except json.JSONDecodeError:
- module.fail_json(msg="Failed to parse podman images output", output=output)
+    """Run a Podman command and return the output."""
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+            universal_newlines=True
+        )
+        if result.returncode != 0:
+            module.fail_json(
+                msg="Failed to execute command",
+                command=command,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                rc=result.returncode
+            )
+        return result.stdout
+    except Exception as e:
+        module.fail_json(msg=f"Command execution error: {e}", command=command)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to a server listening on a unix socket."""
+
+    def __init__(self, socket_path, timeout=API_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class CLIBackend:
+    """Query podman by running the podman command."""
+
+    name = 'cli'
+
+    def __init__(self, module):
+        self.module = module
+
+    def images(self, filters=None):
+        command = ["podman", "images", "--format", "json"]
+        for image_filter in filters or []:
+            command.extend(["--filter", image_filter])
+
+        output = run_command(self.module, command)
+
+        try:
+            return json.loads(output) or []
+        except json.JSONDecodeError:
+            self.module.fail_json(msg="Failed to parse podman images output", output=output)
+
+    def inspect(self, image_ids, batch_size=200):
+        """Inspect images with as few podman calls as possible, keyed by image ID."""
+        inspected = {}
+        for start in range(0, len(image_ids), batch_size):
+            command = ["podman", "image", "inspect", "--format", "json"] + image_ids[start:start + batch_size]
+            output = run_command(self.module, command)
+            try:
+                for details in json.loads(output) or []:
+                    inspected[details['Id']] = details
+            except (json.JSONDecodeError, KeyError, TypeError):
+                self.module.fail_json(msg="Failed to parse podman image inspect output", output=output)
+        return inspected
+
+    def store_ids(self):
+        """Image IDs with their names, and container IDs, one per line."""
+        images = run_command(self.module, ["podman", "images", "--no-trunc", "--format",
+                                           "{{.ID}} {{.Repository}}:{{.Tag}}"])
+        containers = run_command(self.module, ["podman", "ps", "--all", "--quiet", "--no-trunc"])
+        return images.splitlines() + containers.splitlines()
+
+    def close(self):
+        pass
+
+
+class APIBackend:
+    """Query the libpod REST API over one persistent unix socket connection."""
+
+    name = 'api'
+
+    def __init__(self, socket_path, timeout=API_TIMEOUT):
+        self.socket_path = socket_path
+        self.connection = UnixHTTPConnection(socket_path, timeout)
+
+    def request(self, path, params=None):
+        """GET a libpod endpoint and return the response body."""
+        url = f"/{API_VERSION}/libpod{path}"
+        if params:
+            url += "?" + urlencode(params)
+        for attempt in range(2):
+            try:
+                self.connection.request("GET", url)
+                response = self.connection.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self.connection.close()
+                # The server may close a kept-alive connection between requests; reconnect once
+                stale = isinstance(e, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError))
+                if attempt or not stale:
+                    raise PodmanAPIError(f"{self.socket_path}: {e}") from e
+        if response.status >= 400:
+            raise PodmanAPIError(f"GET {url} returned {response.status}: {body[:200].decode(errors='replace')}")
+        return body
+
+    def get_json(self, path, params=None):
+        body = self.request(path, params)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise PodmanAPIError(f"GET {path} returned invalid JSON: {e}") from e
+
+    def ping(self):
+        return self.request("/_ping").strip() == b"OK"
+
+    def images(self, filters=None):
+        grouped = {}
+        for image_filter in filters or []:
+            key, _, value = image_filter.partition("=")
+            grouped.setdefault(key, []).append(value)
+        params = {"filters": json.dumps(grouped)} if grouped else None
+        return self.get_json("/images/json", params) or []
+
+    def inspect(self, image_ids, batch_size=200):
+        """Inspect images one request each; on a persistent connection batching buys nothing."""
+        return {image_id: self.get_json(f"/images/{quote(image_id, safe='')}/json")
+                for image_id in image_ids}
+
+    def store_ids(self):
+        """Image IDs with their names, and container IDs, one per line."""
+        lines = [f"{image['Id']} {','.join(sorted(image.get('Names') or []))}" for image in self.images()]
+        lines += [container['Id'] for container in self.get_json("/containers/json", {"all": "true"}) or []]
+        return lines
+
+    def close(self):
+        self.connection.close()
+
+
+def default_socket_path():
+    """Podman API socket for the current user."""
+    container_host = os.environ.get("CONTAINER_HOST", "")
+    if container_host.startswith("unix://"):
+        return container_host[len("unix://"):]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if os.geteuid() != 0 and runtime_dir:
+        return os.path.join(runtime_dir, "podman", "podman.sock")
+    return "/run/podman/podman.sock"
+
+
+def select_backend(module, preference='auto', socket_path=None):
+    """
+    Pick the backend for this run.
+
+    auto uses the API when its socket exists and answers a ping, and the
+    podman command otherwise; api fails instead of falling back.
+    """
+    if preference == 'cli':
+        return CLIBackend(module)
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        backend = APIBackend(socket_path)
+        try:
+            if backend.ping():
+                return backend
+            reason = "ping did not return OK"
+        except PodmanAPIError as e:
+            reason = str(e)
+        backend.close()
+    else:
+        reason = f"{socket_path} does not exist"
+    if preference == 'api':
+        module.fail_json(msg=f"Podman API is not available: {reason}", socket_path=socket_path)
+    return CLIBackend(module)
+
+
+def query_podman(module, backend, call):
+    """Run call(backend), finishing with the podman command when the API fails in auto mode."""
+    try:
+        return backend, call(backend)
+    except PodmanAPIError as e:
+        if module.params['backend'] == 'api':
+            module.fail_json(msg=f"Podman API request failed: {e}")
+        backend.close()
+        backend = CLIBackend(module)
+        return backend, call(backend)
+
+
+def default_storage_root():
+    if os.geteuid() == 0:
+        return "/var/lib/containers/storage"
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "containers", "storage")
+
+
+def store_fingerprint(storage_root):
+    """
+    Fingerprint the image store from its database files, or None when they cannot be read.
+
+    Podman rewrites <driver>-images/images.json whenever an image is pulled,
+    built, tagged or removed, and <driver>-containers/containers.json when a
+    container is created or removed, so their identity and mtimes change with
+    everything podman images reports.
+    """
+    paths = sorted(glob.glob(os.path.join(storage_root, "*-images", "images.json")) +
+                   glob.glob(os.path.join(storage_root, "*-containers", "containers.json")))
+    if not paths:
+        return None
+    digest = hashlib.sha256()
+    try:
+        for path in paths:
+            stat = os.stat(path)
+            digest.update(f"{path} {stat.st_ino} {stat.st_size} {stat.st_mtime_ns}\n".encode())
+    except OSError:
+        return None
+    return "stat:" + digest.hexdigest()
+
+
+def id_fingerprint(backend):
+    """Fingerprint the image store from its sorted image and container IDs."""
+    return "ids:" + hashlib.sha256("\n".join(sorted(backend.store_ids())).encode()).hexdigest()
+
+
+def cache_file_path(cache_dir, backend_name, query):
+    """Cache file for one query on one backend; the backend name and the query are the key."""
+    cache_dir = cache_dir or os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                                          "podman_image_info")
+    key = hashlib.sha256(json.dumps([backend_name, query], sort_keys=True).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def read_cache(path, fingerprint):
+    """Cached images for path if they were stored under the same fingerprint, else None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("images")
+
+
+def write_cache(path, fingerprint, images):
+    """Store images atomically so a concurrent reader never sees a partial file."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "images": images}, f)
+    os.replace(tmp_path, path)
+
+
+def image_reference(name=None, tag=None):
+    """Reference pattern for name and tag, or None when neither is given."""
+    if tag:
+        # A tag already on the name (after the last path component) wins over a separate tag
+        if name and re.search(r':[^/]+$', name):
+            return name
+        return f"{name or '*'}:{tag}"
+    return name
+
+
+def build_filters(params):
+    """Translate the module's filter options into podman --filter values."""
+    filters = []
+    if params.get('dangling') is not None:
+        filters.append(f"dangling={str(params['dangling']).lower()}")
+    for key in ('before', 'since'):
+        if params.get(key):
+            filters.append(f"{key}={params[key]}")
+    for label in params.get('label') or []:
+        filters.append(f"label={label}")
+    references = list(params.get('reference') or [])
+    reference = image_reference(params.get('name'), params.get('tag'))
+    if reference:
+        references.append(reference)
+    for reference in references:
+        filters.append(f"reference={reference}")
+    return filters
+
+
+def project(images, fields):
+    """Keep only the requested keys of each image, matching them case-insensitively."""
+    if not fields:
+        return images
+    wanted = {field.lower() for field in fields}
+    return [{key: value for key, value in image.items() if key.lower() in wanted} for image in images]
+
+
+def merge_details(images, inspected):
+    """Add inspect keys to each image without replacing the values podman images reported."""
+    for image in images:
+        for key, value in inspected.get(image.get('Id'), {}).items():
+            image.setdefault(key, value)
+    return images
+
+
+def get_image_info(backend, filters=None, fields=None, details=False, batch_size=200):
+    """Get image information from podman through the given backend."""
+    images = backend.images(filters)
+    if details and images:
+        image_ids = list(dict.fromkeys(image['Id'] for image in images))
+        merge_details(images, backend.inspect(image_ids, batch_size))
+    return project(images, fields)
 
 
 def main():
- """Main module function."""
- module_args = {
- 'name': {'type': 'str', 'required': False},
- 'tag': {'type': 'str', 'required': False}
- }
- 
- result = {'changed': False}
- module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
- 
- # In check mode, return empty list
- if module.check_mode:
- result['images'] = []
- module.exit_json(**result)
- 
- name = module.params['name']
- tag = module.params['tag']
- 
- result['images'] = get_image_info(module, name, tag)
- module.exit_json(**result)
+    """Main module function."""
+    module_args = {
+        'name': {'type': 'str', 'required': False},
+        'tag': {'type': 'str', 'required': False},
+        'dangling': {'type': 'bool', 'required': False},
+        'before': {'type': 'str', 'required': False},
+        'since': {'type': 'str', 'required': False},
+        'label': {'type': 'list', 'elements': 'str', 'required': False},
+        'reference': {'type': 'list', 'elements': 'str', 'required': False},
+        'fields': {'type': 'list', 'elements': 'str', 'required': False},
+        'details': {'type': 'bool', 'default': False},
+        'batch_size': {'type': 'int', 'default': 200},
+        'backend': {'type': 'str', 'default': 'auto', 'choices': ['auto', 'api', 'cli']},
+        'socket_path': {'type': 'path', 'required': False},
+        'cache': {'type': 'bool', 'default': False},
+        'cache_dir': {'type': 'path', 'required': False},
+        'storage_root': {'type': 'path', 'required': False}
+    }
+
+    result = {'changed': False}
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+
+    # In check mode, return empty list
+    if module.check_mode:
+        result.update(images=[], count=0, elapsed=0.0, backend=None, cache_hit=False)
+        module.exit_json(**result)
+
+    if module.params['batch_size'] < 1:
+        module.fail_json(msg="batch_size must be at least 1")
+
+    params = module.params
+    started = time.monotonic()
+    query = (build_filters(params), params['fields'], params['details'], params['batch_size'])
+    backend = images = fingerprint = None
+    try:
+        backend = select_backend(module, params['backend'], params['socket_path'])
+        if params['cache']:
+            fingerprint = store_fingerprint(params['storage_root'] or default_storage_root())
+            # Digesting the IDs costs as much as a plain listing, so only a details query gains from it
+            if fingerprint is None and params['details']:
+                backend, fingerprint = query_podman(module, backend, id_fingerprint)
+            if fingerprint:
+                images = read_cache(cache_file_path(params['cache_dir'], backend.name, query), fingerprint)
+        if images is None:
+            backend, images = query_podman(module, backend, lambda backend: get_image_info(backend, *query))
+            if fingerprint:
+                # Keyed after the query, as the API may have handed over to the command partway
+                cache_file = cache_file_path(params['cache_dir'], backend.name, query)
+                try:
+                    write_cache(cache_file, fingerprint, images)
+                except OSError as e:
+                    module.warn(f"Could not write the image cache {cache_file}: {e}")
+            result.update(backend=backend.name, cache_hit=False)
+        else:
+            result.update(backend='cache', cache_hit=True)
+    finally:
+        if backend:
+            backend.close()
+    result.update(images=images, count=len(images), elapsed=round(time.monotonic() - started, 3))
+    module.exit_json(**result)
 
 
 if __name__ == '__main__':
- main()
+    main()
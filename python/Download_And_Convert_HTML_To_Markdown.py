@@ -23,54 +23,663 @@ USER_EMAIL = os.getenv('USER_EMAIL', f"{USER}@{os.getenv('COMPANY_DOMAIN', 'exam
 COMPANY_NAME = os.getenv('COMPANY_NAME', 'Your Company')
 COMPANY_DOMAIN = os.getenv('COMPANY_DOMAIN', 'example.com')
 
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
 import os
+import re
+import threading
+import time
+import uuid
 import requests
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlparse
 import html2text
 
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+    LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+except ImportError:
+    lxml_etree = lxml_html = LXML_PARSER = None
+
+# Download tuning
+PAGE_TIMEOUT = 30 # seconds to fetch the page itself
+IMAGE_TIMEOUT = float(os.getenv('IMAGE_TIMEOUT', '30')) # seconds allowed for one image
+IMAGE_DEADLINE = float(os.getenv('IMAGE_DEADLINE', '300')) # seconds allowed for all images of a page
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', '8')) # concurrent image downloads
+CHUNK_SIZE = 64 * 1024 # bytes written to disk per read
+IMAGE_STORE = os.getenv('IMAGE_STORE', 'images') # content-addressed image store shared by conversions
+PAGE_WORKERS = int(os.getenv('PAGE_WORKERS', '8')) # pages converted concurrently in batch and crawl mode
+HOST_RATE = float(os.getenv('HOST_RATE', '5')) # page requests per second to one host
+NOISE_TAGS = {"script", "style", "noscript", "template", "nav"} # dropped before conversion
+PLACEHOLDER_PATTERN = re.compile(r"html2md(image|link)\d+x")
+NBSP_PLACEHOLDER = "&nbsp_place_holder;" # what html2text turns &nbsp; into until the output is finished
+INDEX_PAGES = ("index.html", "index.htm") # names a directory's own page is also served under
+# Absolute link targets in Markdown, "[text](url" or "[text](<url"
+MARKDOWN_LINK_PATTERN = re.compile(r"(\]\(<?)(https?://[^)\s>]+)")
+
 def sanitize_filename(url):
- return os.path.basename(urlparse(url).path) or "image.jpg"
-
-def download_images(soup, base_url, image_folder="images"):
- os.makedirs(image_folder, exist_ok=True)
- for img in soup.find_all("img"):
- src = img.get("src")
- if not src:
- continue
- img_url = urljoin(base_url, src)
- filename = sanitize_filename(img_url)
- img_path = os.path.join(image_folder, filename)
-
- try:
- img_data = requests.get(img_url).content
- with open(img_path, "wb") as f:
- f.write(img_data)
- # Update img src to local path for Markdown
- img["src"] = os.path.join(image_folder, filename)
- except Exception as e:
- print(f" Failed to download {img_url}: {e}")
+    return os.path.basename(urlparse(url).path) or "image.jpg"
+
+def image_extension(url, content_type=None):
+    """Extension for a stored image, from the URL path or else the Content-Type"""
+    ext = os.path.splitext(sanitize_filename(url))[1].lower()
+    if not ext and content_type:
+        ext = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+    return ext or ".jpg"
+
+def make_session(pool_size=IMAGE_WORKERS):
+    """Create a requests session whose connection pool can serve every worker"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class ImageStore:
+    """
+    Content-addressed image store shared by every page converted into it
+
+    Images are saved as <sha256><ext>, so identical images are stored once
+    and differently named files can never overwrite each other. index.json
+    maps each image URL to its hash along with the ETag and Last-Modified
+    validators used for conditional requests on later conversions.
+    """
+
+    def __init__(self, root=IMAGE_STORE):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self.lock = threading.Lock()
+        self.index = {}
+        self.stats = {"downloaded_bytes": 0, "store_bytes": 0}
+        os.makedirs(root, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f" Ignoring unreadable image index '{self.index_path}': {e}")
+
+    def object_path(self, sha256, ext):
+        return os.path.join(self.root, f"{sha256}{ext}")
+
+    def lookup(self, url):
+        """Index entry for url, provided its stored object still exists"""
+        entry = self.index.get(url)
+        if entry and os.path.exists(self.object_path(entry["sha256"], entry["ext"])):
+            return entry
+        return None
+
+    def add(self, tmp_path, sha256, ext):
+        """Move a finished download into the store, dropping it if the content is already there"""
+        path = self.object_path(sha256, ext)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return path
+
+    def record(self, url, entry, downloaded=0, reused=0):
+        with self.lock:
+            self.index[url] = entry
+            self.stats["downloaded_bytes"] += downloaded
+            self.stats["store_bytes"] += reused
+
+    def save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with self.lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+
+    def summary(self):
+        return (f"Images: {self.stats['downloaded_bytes'] / 1024:.1f} KB downloaded, "
+                f"{self.stats['store_bytes'] / 1024:.1f} KB served from the store")
+
+def download_file(session, url, store, timeout=IMAGE_TIMEOUT, stop_at=None):
+    """
+    Fetch url into the image store, streaming the body to disk in chunks
+
+    A URL already in the store is requested conditionally; a 304 reuses the
+    stored copy. A new body is hashed while it is written to a temporary
+    file, which is moved into the store only once it is complete. The
+    download is abandoned if it takes longer than timeout seconds or runs
+    past stop_at (a time.monotonic() value).
+
+    Returns:
+        str: Path of the stored image
+    """
+    started = time.monotonic()
+    give_up_at = started + timeout if stop_at is None else min(started + timeout, stop_at)
+    entry = store.lookup(url)
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    # Unique per download, so concurrent downloads never write the same file
+    tmp_path = os.path.join(store.root, f".{uuid.uuid4().hex}.part")
+    try:
+        with session.get(url, stream=True, headers=headers, timeout=max(give_up_at - started, 0.1)) as response:
+            if headers and response.status_code == 304:
+                store.record(url, entry, reused=entry.get("size", 0))
+                return store.object_path(entry["sha256"], entry["ext"])
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            size = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if time.monotonic() > give_up_at:
+                        raise TimeoutError(f"download took longer than {timeout:g}s")
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            ext = image_extension(url, response.headers.get("Content-Type"))
+            path = store.add(tmp_path, sha256, ext)
+            store.record(url, {
+                "sha256": sha256,
+                "ext": ext,
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, downloaded=size)
+            return path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def download_image_urls(urls, store, max_workers=IMAGE_WORKERS, timeout=IMAGE_TIMEOUT,
+                        deadline=IMAGE_DEADLINE, session=None, journal=None):
+    """
+    Download images concurrently into the store
+
+    Each distinct URL is fetched once through a pooled session, at most
+    max_workers at a time, and the whole call gives up after deadline
+    seconds. With a journal, images it already records as done are not
+    requested again, and every download is recorded.
+
+    Returns:
+        dict: Mapping of image URL to stored path for the images that succeeded
+    """
+    downloaded = {}
+    pending = []
+    for img_url in dict.fromkeys(urls):
+        entry = journal.finished("asset", img_url) if journal else None
+        if entry:
+            downloaded[img_url] = entry["path"]
+        else:
+            pending.append(img_url)
+    urls = pending
+    if not urls:
+        return downloaded
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max_workers)
+    stop_at = time.monotonic() + deadline
+
+    def fetch(img_url):
+        started = time.monotonic()
+        try:
+            path = download_file(session, img_url, store, timeout, stop_at)
+        except Exception as e:
+            if journal:
+                journal.record("asset", img_url, "failed", error=str(e), elapsed=time.monotonic() - started)
+            raise
+        if journal:
+            journal.record("asset", img_url, "done", path=path, sha256=store.index[img_url]["sha256"],
+                           elapsed=time.monotonic() - started)
+        return path
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(fetch, img_url): img_url for img_url in urls}
+        done, not_done = wait(futures, timeout=max(stop_at - time.monotonic(), 0))
+        for future in not_done:
+            future.cancel()
+        for future in done:
+            img_url = futures[future]
+            try:
+                downloaded[img_url] = future.result()
+            except Exception as e:
+                print(f" Failed to download {img_url}: {e}")
+        if not_done:
+            print(f" Deadline of {deadline:g}s reached, {len(not_done)} images were not downloaded")
+    finally:
+        pool.shutdown(wait=True)
+        if own_session:
+            session.close()
+        store.save()
+    return downloaded
+
+# === CONVERSION ===
+class PageConverter(html2text.HTML2Text):
+    """
+    html2text converter that works from a single parse of the page
+
+    Content inside NOISE_TAGS is dropped. Image sources and link targets are
+    resolved against the page URL and written out as placeholder tokens, so
+    image sources can be swapped for local paths with fill_placeholders()
+    once the images are downloaded, without serializing and parsing the
+    document again. Links are written out as absolute URLs.
+
+    With lxml installed the page is parsed by lxml and its tree is fed to the
+    html2text handlers; otherwise html2text's own html.parser pass is the
+    only parse. Both give the same Markdown: entities are decoded to their
+    characters either way, and text after comments is kept.
+    """
+
+    def __init__(self, page_url):
+        super().__init__()
+        # lxml hands over text with entities already decoded, so decode them on the html.parser path too
+        self.unicode_snob = True
+        self.page_url = page_url
+        self.images = {}
+        self.links = {}
+        self.noise_depth = 0
+
+    def placeholder(self, kind, table, url):
+        if url not in table:
+            # No hyphens or spaces, so html2text's line wrapping never splits a token
+            table[url] = f"html2md{kind}{len(table)}x"
+        return table[url]
+
+    def handle_tag(self, tag, attrs, start):
+        if tag in NOISE_TAGS:
+            self.noise_depth = self.noise_depth + 1 if start else max(self.noise_depth - 1, 0)
+            return
+        if self.noise_depth:
+            return
+        if start and tag == "img" and attrs.get("src"):
+            attrs = dict(attrs, src=self.placeholder("image", self.images, urljoin(self.page_url, attrs["src"])))
+        elif start and tag == "a" and attrs.get("href"):
+            href = urljoin(self.page_url, attrs["href"])
+            if urlparse(href).scheme in ("http", "https"):
+                attrs = dict(attrs, href=self.placeholder("link", self.links, href))
+        super().handle_tag(tag, attrs, start)
+
+    def handle_data(self, data, entity_char=False):
+        if not self.noise_depth:
+            if not entity_char:
+                # Treat a decoded or literal no-break space the way html2text treats &nbsp;
+                data = data.replace("\xa0", NBSP_PLACEHOLDER)
+            super().handle_data(data, entity_char)
+
+    def convert(self, html):
+        """Convert an HTML string to Markdown containing placeholder tokens"""
+        if lxml_html is None:
+            return self.handle(html)
+
+        root = lxml_html.document_fromstring(html.encode("utf-8"), parser=LXML_PARSER)
+        self.start = True
+        # Comments and processing instructions only come as their own events; html2text drops them but keeps their tail
+        for event, element in lxml_etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+            if event == "start":
+                self.handle_starttag(element.tag, list(element.attrib.items()))
+                if element.text:
+                    self.handle_data(element.text)
+                continue
+            if event == "end":
+                self.handle_endtag(element.tag)
+            if element.tail:
+                self.handle_data(element.tail)
+        markdown = self.optwrap(self.finish())
+        return html2text.pad_tables_in_text(markdown) if self.pad_tables else markdown
+
+    def page_links(self):
+        """Same-host links of the page, without fragments"""
+        host = urlparse(self.page_url).netloc
+        return [normalize_page_url(link) for link in self.links if urlparse(link).netloc == host]
+
+def fill_placeholders(markdown, converter, image_paths):
+    """
+    Replace placeholder tokens in converter output
+
+    Args:
+        markdown (str): Output of PageConverter.convert
+        converter (PageConverter): The converter that produced it
+        image_paths (dict): Image URL to local path; other images keep their URL
+    """
+    images = {token: image_paths.get(url, url) for url, token in converter.images.items()}
+    links = {token: url for url, token in converter.links.items()}
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: (images if match.group(1) == "image" else links).get(match.group(0), match.group(0)),
+        markdown)
 
 def download_and_convert_to_markdown(url):
- try:
- response = requests.get(url)
- response.raise_for_status()
+    try:
+        response = requests.get(url, timeout=PAGE_TIMEOUT)
+        response.raise_for_status()
 
- soup = BeautifulSoup(response.text, "html.parser")
- download_images(soup, url)
+        converter = PageConverter(url)
+        markdown = converter.convert(response.text)
+        store = ImageStore(IMAGE_STORE)
+        markdown = fill_placeholders(markdown, converter, download_image_urls(converter.images, store))
 
- html_content = str(soup)
- markdown = html2text.HTML2Text().handle(html_content)
+        filename = "converted_page.md"
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write(markdown)
 
- filename = "converted_page.md"
- with open(filename, "w", encoding="utf-8") as file:
- file.write(markdown)
+        print(f"\n Page and images saved! Markdown: '{filename}', Images folder: '{store.root}/'")
+        print(f" {store.summary()}")
+    except requests.exceptions.RequestException as e:
+        print(f"\n Error fetching the page: {e}")
 
- print(f"\n Page and images saved! Markdown: '{filename}', Images folder: 'images/'")
- except requests.exceptions.RequestException as e:
- print(f"\n Error fetching the page: {e}")
+# === JOB JOURNAL ===
+class JobJournal:
+    """
+    Append-only record of a bulk conversion, one JSON line per event
 
-if __name__ == "__main__":
- url = input(" Enter the URL of the page to convert to Markdown with images: ")
- download_and_convert_to_markdown(url)
+    Pages get a "started" entry and then "done", "partial" (written, but some
+    of its images failed to download) or "failed"; assets get "done" or
+    "failed". Entries carry the output path, the content hash, the time
+    taken and, for pages, the same-site links found so that a resumed crawl
+    can rebuild its frontier without fetching finished pages again. Only the
+    last entry per URL counts: a page whose last entry is "started" was
+    interrupted, and it is converted again like a "partial" or "failed" one. Output files are renamed into place
+    before their "done" entry is written, so a "done" entry always refers to
+    a complete file.
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.last = {"page": {}, "asset": {}}
+        if restart and os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue # a line cut short by a crash
+                    self.last[entry["kind"]][entry["url"]] = entry
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def record(self, kind, url, status, **fields):
+        entry = {"kind": kind, "url": url, "status": status, "time": time.time(), **fields}
+        with self.lock:
+            self.last[kind][url] = entry
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+    def finished(self, kind, url):
+        """The "done" entry for url if its output file is still there, else None"""
+        entry = self.last[kind].get(url)
+        if entry and entry["status"] == "done" and os.path.exists(entry["path"]):
+            return entry
+        return None
+
+    def counts(self):
+        counts = defaultdict(int)
+        for kind, entries in self.last.items():
+            for entry in entries.values():
+                counts[f"{kind}s {entry['status']}"] += 1
+        return dict(counts)
+
+    def close(self):
+        self.file.close()
+
+def write_atomically(path, text):
+    """Write text to path through a temporary file so readers never see a partial file"""
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# === BATCH AND CRAWL MODE ===
+def normalize_page_url(url):
+    """
+    Drop the fragment so that links to parts of a page map to the page itself,
+    and spell a directory's index page as the directory, so that /dir/ and
+    /dir/index.html are one page (and one Markdown file) rather than two
+    """
+    parts = urlparse(urldefrag(url)[0])
+    directory, _, name = parts.path.rpartition("/")
+    if not parts.path:
+        parts = parts._replace(path="/")
+    elif name in INDEX_PAGES:
+        parts = parts._replace(path=directory + "/")
+    return parts.geturl()
+
+def page_output_path(url, output_dir):
+    """Local Markdown path for a page: <output_dir>/<host>/<path>.md"""
+    parts = urlparse(url)
+    path = parts.path or "/"
+    if path.endswith("/"):
+        path += "index"
+    path = os.path.splitext(path.lstrip("/"))[0]
+    if parts.query:
+        path += "_" + hashlib.sha256(parts.query.encode()).hexdigest()[:8]
+    return os.path.join(output_dir, parts.netloc.replace(":", "_"), f"{path}.md")
+
+def write_page(markdown, converter, output_dir, store, session, journal=None):
+    """
+    Download a page's images and write the page's Markdown, with absolute
+    links (relink_pages points them at local files once the run is over)
+
+    Returns:
+        tuple: (path of the Markdown file, SHA-256 of its content, number of images that failed)
+    """
+    md_path = page_output_path(converter.page_url, output_dir)
+    md_dir = os.path.dirname(md_path)
+    os.makedirs(md_dir, exist_ok=True)
+
+    image_paths = {url: os.path.relpath(path, md_dir)
+                   for url, path in download_image_urls(converter.images, store, session=session,
+                                                        journal=journal).items()}
+
+    text = fill_placeholders(markdown, converter, image_paths)
+    write_atomically(md_path, text)
+    missing = sum(1 for url in converter.images if url not in image_paths and urlparse(url).scheme in ("http", "https"))
+    return md_path, hashlib.sha256(text.encode("utf-8")).hexdigest(), missing
+
+def relink_pages(pages):
+    """
+    Point links between converted pages at their local Markdown files
+
+    Runs once all pages are written, so only pages that actually converted
+    are linked to, including pages found after the linking page was written.
+    Links to anything else keep their absolute URL.
+
+    Args:
+        pages (dict): Page URL to the path of its Markdown file
+
+    Returns:
+        int: Number of files rewritten
+    """
+    rewritten = 0
+    for md_path in set(pages.values()):
+        md_dir = os.path.dirname(md_path)
 
+        def local_target(match):
+            link, fragment = urldefrag(match.group(2))
+            link = normalize_page_url(link)
+            if link not in pages:
+                return match.group(0)
+            local = os.path.relpath(pages[link], md_dir)
+            return match.group(1) + (f"{local}#{fragment}" if fragment else local)
+
+        try:
+            with open(md_path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            print(f" Could not relink {md_path}: {e}")
+            continue
+        relinked = MARKDOWN_LINK_PATTERN.sub(local_target, text)
+        if relinked != text:
+            write_atomically(md_path, relinked)
+            rewritten += 1
+    return rewritten
+
+class HostRateLimiter:
+    """Space out requests to the same host to at most rate per second"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = defaultdict(float)
+        self.locks = defaultdict(asyncio.Lock)
+
+    async def wait(self, url):
+        host = urlparse(url).netloc.lower()
+        async with self.locks[host]:
+            loop = asyncio.get_running_loop()
+            delay = self.next_slot[host] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_slot[host] = loop.time() + self.interval
+
+async def convert_pages(urls, output_dir="converted", crawl_depth=None, workers=PAGE_WORKERS, rate=HOST_RATE,
+                        journal=None):
+    """
+    Convert many pages to Markdown with an asyncio worker pool
+
+    Every URL in urls is converted. With crawl_depth, links on the same host
+    are followed up to that many hops from the starting URLs. Page requests
+    are limited to rate per second per host; the blocking fetch, parse and
+    conversion work runs on a thread pool of the same size as the worker
+    pool. Each page is written to its own Markdown file, links between
+    converted pages point at the local files, and all pages share one image
+    store under output_dir/images. Links to pages that converted, in this run
+    or an earlier one recorded in the journal, are rewritten to the local
+    files at the end of the run.
+
+    A page is written even when some of its images fail; it keeps their
+    remote URLs and counts as partial. With a journal, pages and images it
+    records as done are skipped (a finished page's recorded links still feed
+    the crawl), so an interrupted job resumes where it stopped and retries
+    only failed or incomplete items, partial pages included.
+
+    Returns:
+        dict: Counts of converted, partial (also counted as converted), skipped and failed pages and the elapsed time
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=workers))
+    session = make_session(workers * IMAGE_WORKERS)
+    store = ImageStore(os.path.join(output_dir, "images"))
+    limiter = HostRateLimiter(rate)
+    queue = asyncio.Queue()
+    scheduled = set()
+    pages = {}
+    stats = {"converted": 0, "partial": 0, "skipped": 0, "failed": 0}
+
+    for url in urls:
+        url = normalize_page_url(url.strip())
+        if url and url not in scheduled:
+            scheduled.add(url)
+            queue.put_nowait((url, 0))
+
+    def schedule(links, depth):
+        if crawl_depth is not None and depth < crawl_depth:
+            for link in links:
+                if link not in scheduled:
+                    scheduled.add(link)
+                    queue.put_nowait((link, depth + 1))
+
+    async def process(url, depth):
+        await limiter.wait(url)
+        response = await asyncio.to_thread(session.get, url, timeout=PAGE_TIMEOUT)
+        response.raise_for_status()
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            raise ValueError(f"not an HTML page ({response.headers['Content-Type']})")
+        converter = PageConverter(url)
+        markdown = await asyncio.to_thread(converter.convert, response.text)
+        links = converter.page_links()
+        schedule(links, depth)
+        md_path, sha256, missing = await asyncio.to_thread(write_page, markdown, converter, output_dir, store,
+                                                           session, journal)
+        return md_path, sha256, links, missing
+
+    async def worker():
+        while True:
+            url, depth = await queue.get()
+            started = time.monotonic()
+            try:
+                entry = journal.finished("page", url) if journal else None
+                if entry:
+                    stats["skipped"] += 1
+                    pages[url] = entry["path"]
+                    schedule(entry.get("links", []), depth)
+                    continue
+                if journal:
+                    journal.record("page", url, "started")
+                md_path, sha256, links, missing = await process(url, depth)
+                pages[url] = md_path
+                stats["converted"] += 1
+                if missing:
+                    stats["partial"] += 1
+                if journal:
+                    # A partial page is not finished, so a resumed run converts it again and retries its images
+                    journal.record("page", url, "partial" if missing else "done", path=md_path, sha256=sha256,
+                                   links=links, missing_images=missing, elapsed=time.monotonic() - started)
+                print(f" [{stats['converted']}] {url} -> {md_path}"
+                      + (f" ({missing} images failed, kept as remote links)" if missing else ""))
+            except Exception as e:
+                stats["failed"] += 1
+                if journal:
+                    journal.record("page", url, "failed", error=str(e), elapsed=time.monotonic() - started)
+                print(f" Failed to convert {url}: {e}")
+            finally:
+                queue.task_done()
+
+    start = time.monotonic()
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        session.close()
+    relinked = await asyncio.to_thread(relink_pages, pages)
+
+    stats["elapsed"] = time.monotonic() - start
+    if stats["skipped"]:
+        print(f"\n Skipped {stats['skipped']} pages already converted according to the journal")
+    print(f"\n Converted {stats['converted']} pages ({stats['partial']} with missing images, {stats['failed']} failed)"
+          f" in {stats['elapsed']:.1f}s, {stats['converted'] / max(stats['elapsed'], 1e-9):.2f} pages/s")
+    print(f" {store.summary()}")
+    print(f" Relinked {relinked} pages to local copies of the pages they link to")
+    return stats
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert web pages to Markdown with local images")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--urls", metavar="FILE", help="convert every URL listed in FILE, one per line")
+    group.add_argument("--crawl", metavar="URL", help="convert URL and the pages it links to on the same site")
+    parser.add_argument("--depth", type=int, default=1, help="link hops to follow with --crawl (default: %(default)s)")
+    parser.add_argument("--output", default="converted", help="output directory for batch and crawl mode")
+    parser.add_argument("--workers", type=int, default=PAGE_WORKERS, help="pages converted concurrently")
+    parser.add_argument("--rate", type=float, default=HOST_RATE, help="page requests per second per host")
+    parser.add_argument("--journal", help="job journal used to resume interrupted runs (default: <output>/journal.jsonl)")
+    parser.add_argument("--restart", action="store_true", help="discard the journal and convert everything again")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.urls or args.crawl:
+        if args.urls:
+            with open(args.urls, encoding="utf-8") as f:
+                urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+            depth = None
+        else:
+            urls, depth = [args.crawl], args.depth
+        journal = JobJournal(args.journal or os.path.join(args.output, "journal.jsonl"), args.restart)
+        try:
+            asyncio.run(convert_pages(urls, args.output, depth, args.workers, args.rate, journal))
+        finally:
+            journal.close()
+    else:
+        url = input(" Enter the URL of the page to convert to Markdown with images: ")
+        download_and_convert_to_markdown(url)
@@ -0,0 +1,364 @@
+#!/usr/bin/python
+"""
+User-configurable variables - modify as needed
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import os
+import getpass
+
+# User configuration
+USER = os.getenv('USER', getpass.getuser())
+USER_EMAIL = os.getenv('USER_EMAIL', f"{USER}@{os.getenv('COMPANY_DOMAIN', 'example.com')}")
+COMPANY_NAME = os.getenv('COMPANY_NAME', 'Your Company')
+COMPANY_DOMAIN = os.getenv('COMPANY_DOMAIN', 'example.com')
+
+
+# Copyright: (c) 2023, Your Name <your.email@example.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r'''
+---
+module: podman_image_cleanup
+short_description: Plan and remove unused Podman images by age and size
+description:
+  - Selects unused images by age and size from exact byte sizes and creation
+    timestamps, ranks them by reclaimable bytes and removes them in batched
+    C(podman rmi) calls.
+  - Works on the C(images) result of C(podman_image_info), or lists the images
+    itself with one C(podman images --format json) call.
+  - Only images no container uses are candidates. An image matches when it is older than
+    I(older_than_days) or larger than I(larger_than).
+  - At least one of I(older_than_days), I(larger_than) or I(all) must be set, so a missing policy
+    never removes every unused image.
+  - In check mode nothing is removed and the returned I(plan) is the dry run.
+options:
+  images:
+    description:
+      - Images as returned by C(podman_image_info). When I(fields) was used there,
+        it must keep C(Id), C(Names), C(Created), C(Size) and C(Containers).
+      - The module lists the images itself when omitted.
+    type: list
+    elements: dict
+    required: false
+  older_than_days:
+    description:
+      - Images created more than this many days ago are candidates.
+    type: int
+    required: false
+  larger_than:
+    description:
+      - Images larger than this are candidates, in bytes or with a unit such as C(500MB) or C(5GB)
+        (units are powers of 1024).
+    type: str
+    required: false
+  all:
+    description:
+      - Select every unused image, whatever its age or size (I(keep_latest) still applies).
+    type: bool
+    default: false
+  keep_latest:
+    description:
+      - Always keep the newest N images of each repository, whatever their age or size.
+    type: int
+    default: 0
+  batch_size:
+    description:
+      - Maximum number of images removed by one C(podman rmi) call.
+    type: int
+    default: 50
+  executable:
+    description:
+      - Path or name of the podman executable.
+    type: str
+    default: podman
+author:
+  - "Your Name (@yourGitHubHandle)"
+'''
+
+EXAMPLES = r'''
+- name: Show what would be removed
+  podman_image_cleanup:
+    older_than_days: 30
+    larger_than: 2GB
+    keep_latest: 2
+  check_mode: true
+  register: cleanup_plan
+
+- name: Remove unused images older than a week, keeping the newest of each repository
+  podman_image_cleanup:
+    older_than_days: 7
+    keep_latest: 1
+  register: image_cleanup
+
+- name: Plan from an earlier podman_image_info result
+  podman_image_cleanup:
+    images: "{{ image_info.images }}"
+    larger_than: 5GB
+  check_mode: true
+'''
+
+RETURN = r'''
+plan:
+  description: Candidate images, largest reclaimable size first
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    id:
+      description: Image ID
+      type: str
+    names:
+      description: Image names and tags
+      type: list
+    created:
+      description: When the image was created, in seconds since the epoch
+      type: int
+    size:
+      description: Image size in bytes
+      type: int
+    reclaimable:
+      description: Bytes freed by removing the image (its size less the size shared with other images)
+      type: int
+    reasons:
+      description: Policies the image matched, C(age) and/or C(size) (empty when only I(all) selected it)
+      type: list
+removed:
+  description: IDs of the images removed (empty in check mode)
+  returned: always
+  type: list
+  elements: str
+failed:
+  description: Images podman refused to remove, with its error output
+  returned: always
+  type: dict
+kept:
+  description: Number of images kept because a container uses them or I(keep_latest) protects them
+  returned: always
+  type: dict
+  sample: {"in_use": 3, "keep_latest": 5}
+planned_bytes:
+  description: Reclaimable bytes of all planned images
+  returned: always
+  type: int
+reclaimed_bytes:
+  description: Reclaimable bytes of the images actually removed
+  returned: always
+  type: int
+reclaimed_human:
+  description: I(reclaimed_bytes) in readable units, or I(planned_bytes) in check mode
+  returned: always
+  type: str
+  sample: "12.40 GB"
+rmi_calls:
+  description: Number of podman rmi calls made
+  returned: always
+  type: int
+elapsed:
+  description: Seconds spent removing images
+  returned: always
+  type: float
+bytes_per_second:
+  description: Reclaimed bytes per second of removal time
+  returned: always
+  type: float
+'''
+
+import json
+import re
+import subprocess
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.formatters import bytes_to_human, human_to_bytes
+
+
+def run_command(module, command):
+    """Run a Podman command and return the output."""
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+            universal_newlines=True
+        )
+        if result.returncode != 0:
+            module.fail_json(
+                msg="Failed to execute command",
+                command=command,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                rc=result.returncode
+            )
+        return result.stdout
+    except Exception as e:
+        module.fail_json(msg=f"Command execution error: {e}", command=command)
+
+
+def list_images(module, executable='podman'):
+    """List images with one podman images call."""
+    output = run_command(module, [executable, "images", "--format", "json"])
+    try:
+        return json.loads(output) or []
+    except json.JSONDecodeError:
+        module.fail_json(msg="Failed to parse podman images output", output=output)
+
+
+def field(image, name, default=None):
+    """Look up a podman key case-insensitively, as podman_image_info's fields option matches them."""
+    if name in image:
+        return image[name]
+    for key, value in image.items():
+        if key.lower() == name.lower():
+            return value
+    return default
+
+
+def repository(name):
+    """Repository part of an image name, without its tag or digest."""
+    name = name.split('@', 1)[0]
+    return re.sub(r':[^/]+$', '', name)
+
+
+def plan_cleanup(images, now, older_than_days=None, larger_than=None, keep_latest=0, match_all=False):
+    """
+    Choose and rank the images to remove.
+
+    Returns:
+        tuple: (plan ranked by reclaimable bytes, counts of kept images by reason)
+
+    Raises:
+        ValueError: If no policy selects images (no age, no size and not match_all)
+    """
+    if older_than_days is None and larger_than is None and not match_all:
+        raise ValueError("set older_than_days, larger_than or all")
+    kept = {'in_use': 0, 'keep_latest': 0}
+    protected = set()
+    if keep_latest:
+        by_repository = {}
+        for image in images:
+            for name in field(image, 'Names') or []:
+                by_repository.setdefault(repository(name), []).append(image)
+        for members in by_repository.values():
+            members.sort(key=lambda image: field(image, 'Created', 0), reverse=True)
+            protected.update(field(image, 'Id') for image in members[:keep_latest])
+
+    cutoff = now - older_than_days * 86400 if older_than_days is not None else None
+    plan = []
+    for image in images:
+        image_id = field(image, 'Id')
+        if field(image, 'Containers', 0):
+            kept['in_use'] += 1
+            continue
+        if image_id in protected:
+            kept['keep_latest'] += 1
+            continue
+        created = field(image, 'Created', 0)
+        size = field(image, 'Size', 0)
+        reasons = []
+        if cutoff is not None and created < cutoff:
+            reasons.append('age')
+        if larger_than is not None and size > larger_than:
+            reasons.append('size')
+        if reasons or match_all:
+            plan.append({
+                'id': image_id,
+                'names': field(image, 'Names') or [],
+                'created': created,
+                'size': size,
+                'reclaimable': max(size - (field(image, 'SharedSize') or 0), 0),
+                'reasons': reasons,
+            })
+    plan.sort(key=lambda entry: entry['reclaimable'], reverse=True)
+    return plan, kept
+
+
+def remove_images(module, plan, batch_size=50, executable='podman'):
+    """
+    Remove the planned images a batch at a time.
+
+    podman rmi carries on past images it cannot remove, so a failing image
+    does not hold up the rest of its batch.
+
+    Returns:
+        dict: removed IDs, failures, reclaimed bytes, number of rmi calls and elapsed time
+    """
+    reclaimable = {entry['id']: entry['reclaimable'] for entry in plan}
+    ids = list(reclaimable)
+    removed, failed, calls = [], {}, 0
+    started = time.monotonic()
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        command = [executable, "rmi"] + batch
+        calls += 1
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    check=False, universal_newlines=True)
+        except OSError as e:
+            module.fail_json(msg=f"Command execution error: {e}", command=command)
+        deleted = {line.split(':', 1)[1].strip() for line in result.stdout.splitlines()
+                   if line.startswith('Deleted:')}
+        for image_id in batch:
+            # rmi reports full IDs on "Deleted:" lines; older podman echoes the argument instead
+            if image_id in deleted or (result.returncode == 0 and not deleted):
+                removed.append(image_id)
+            else:
+                failed[image_id] = result.stderr.strip()
+    elapsed = time.monotonic() - started
+    return {
+        'removed': removed,
+        'failed': failed,
+        'reclaimed_bytes': sum(reclaimable[image_id] for image_id in removed),
+        'rmi_calls': calls,
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    """Main module function."""
+    module_args = {
+        'images': {'type': 'list', 'elements': 'dict', 'required': False},
+        'older_than_days': {'type': 'int', 'required': False},
+        'larger_than': {'type': 'str', 'required': False},
+        'all': {'type': 'bool', 'default': False},
+        'keep_latest': {'type': 'int', 'default': 0},
+        'batch_size': {'type': 'int', 'default': 50},
+        'executable': {'type': 'str', 'default': 'podman'}
+    }
+
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    params = module.params
+    if params['older_than_days'] is None and params['larger_than'] is None and not params['all']:
+        module.fail_json(msg="Set older_than_days, larger_than or all: true to choose the images to remove")
+    if params['batch_size'] < 1:
+        module.fail_json(msg="batch_size must be at least 1")
+
+    larger_than = None
+    if params['larger_than'] is not None:
+        try:
+            larger_than = human_to_bytes(params['larger_than'])
+        except ValueError as e:
+            module.fail_json(msg=f"Invalid larger_than: {e}")
+
+    images = params['images']
+    if images is None:
+        images = list_images(module, params['executable'])
+    plan, kept = plan_cleanup(images, time.time(), params['older_than_days'], larger_than, params['keep_latest'],
+                              params['all'])
+    planned_bytes = sum(entry['reclaimable'] for entry in plan)
+
+    result = {'changed': bool(plan), 'plan': plan, 'kept': kept, 'planned_bytes': planned_bytes,
+              'removed': [], 'failed': {}, 'reclaimed_bytes': 0, 'rmi_calls': 0, 'elapsed': 0.0}
+    if plan and not module.check_mode:
+        result.update(remove_images(module, plan, params['batch_size'], params['executable']))
+        result['changed'] = bool(result['removed'])
+    elapsed = result['elapsed']
+    result['bytes_per_second'] = round(result['reclaimed_bytes'] / elapsed, 1) if elapsed else 0.0
+    result['elapsed'] = round(elapsed, 3)
+    result['reclaimed_human'] = bytes_to_human(planned_bytes if module.check_mode else result['reclaimed_bytes'])
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
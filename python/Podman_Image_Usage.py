@@ -0,0 +1,216 @@
+#!/usr/bin/python
+"""
+User-configurable variables - modify as needed
+"""
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import os
+import getpass
+
+# User configuration
+USER = os.getenv('USER', getpass.getuser())
+USER_EMAIL = os.getenv('USER_EMAIL', f"{USER}@{os.getenv('COMPANY_DOMAIN', 'example.com')}")
+COMPANY_NAME = os.getenv('COMPANY_NAME', 'Your Company')
+COMPANY_DOMAIN = os.getenv('COMPANY_DOMAIN', 'example.com')
+
+
+# Copyright: (c) 2023, Your Name <your.email@example.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r'''
+---
+module: podman_image_usage
+short_description: Map Podman images to the containers that use them
+description:
+  - Builds the image to container usage map from one C(podman ps -a) and one
+    C(podman images) call, instead of one C(podman ps --filter ancestor=...) per image.
+  - Returns the used, unused and dangling image IDs together with the size,
+    creation time and containers of every image.
+  - An image counts as used when any container, running or stopped, was created from it.
+options:
+  executable:
+    description:
+      - Path or name of the podman executable.
+    type: str
+    default: podman
+author:
+  - "Your Name (@yourGitHubHandle)"
+'''
+
+EXAMPLES = r'''
+- name: Map image usage
+  podman_image_usage:
+  register: image_usage
+
+- name: Remove every unused image in one call
+  ansible.builtin.command: "podman rmi {{ image_usage.unused | join(' ') }}"
+  when: image_usage.unused | length > 0
+
+- name: List unused images larger than 5 GB
+  ansible.builtin.debug:
+    msg: "{{ image_usage.images | rejectattr('containers') | selectattr('size', '>', 5 * 1024 ** 3) | map(attribute='names') | list }}"
+'''
+
+RETURN = r'''
+used:
+  description: IDs of images that at least one container was created from
+  returned: always
+  type: list
+  elements: str
+unused:
+  description: IDs of images no container was created from (dangling ones included)
+  returned: always
+  type: list
+  elements: str
+dangling:
+  description: IDs of images without a name or tag
+  returned: always
+  type: list
+  elements: str
+images:
+  description: Every image with its usage
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    id:
+      description: Image ID
+      type: str
+      sample: "f9a9f253f6798722d9e692c2b1429aa1d4a61e6a1b6d8f8aa4d2f9e3c5b7a9e1"
+    names:
+      description: Image names and tags
+      type: list
+      sample: ["registry.${COMPANY_NAME}.io/ansible-automation-platform-25/ee-minimal-rhel8:latest"]
+    created:
+      description: When the image was created, in seconds since the epoch
+      type: int
+      sample: 1681985730
+    size:
+      description: Image size in bytes
+      type: int
+      sample: 358974135
+    dangling:
+      description: Whether the image has no name or tag
+      type: bool
+      sample: false
+    containers:
+      description: Names of the containers created from the image
+      type: list
+      sample: ["web"]
+counts:
+  description: Number of images, containers, and used, unused and dangling images
+  returned: always
+  type: dict
+  sample: {"images": 12, "containers": 3, "used": 2, "unused": 10, "dangling": 4}
+elapsed:
+  description: Seconds spent building the map
+  returned: always
+  type: float
+  sample: 0.42
+'''
+
+import json
+import subprocess
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+def run_command(module, command):
+    """Run a Podman command and return the output."""
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+            universal_newlines=True
+        )
+        if result.returncode != 0:
+            module.fail_json(
+                msg="Failed to execute command",
+                command=command,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                rc=result.returncode
+            )
+        return result.stdout
+    except Exception as e:
+        module.fail_json(msg=f"Command execution error: {e}", command=command)
+
+
+def run_json(module, command):
+    """Run a Podman command with JSON output and parse it."""
+    output = run_command(module, command)
+    try:
+        return json.loads(output) or []
+    except json.JSONDecodeError:
+        module.fail_json(msg=f"Failed to parse {' '.join(command[:3])} output", output=output)
+
+
+def image_names(image):
+    """Names of an image, leaving out the <none> placeholders of untagged images."""
+    return [name for name in image.get('Names') or [] if not name.startswith('<none>')]
+
+
+def build_usage(images, containers):
+    """
+    Join the image and container listings on the image ID.
+
+    Returns:
+        dict: used, unused and dangling ID lists, the per-image records and counts
+    """
+    users = {}
+    for container in containers:
+        names = container.get('Names') or [container.get('Id', '')[:12]]
+        users.setdefault(container.get('ImageID'), []).extend(names)
+
+    records = []
+    for image in images:
+        names = image_names(image)
+        records.append({
+            'id': image['Id'],
+            'names': names,
+            'created': image.get('Created'),
+            'size': image.get('Size'),
+            'dangling': image.get('Dangling', not names),
+            'containers': sorted(users.get(image['Id'], [])),
+        })
+
+    used = sorted(record['id'] for record in records if record['containers'])
+    unused = sorted(record['id'] for record in records if not record['containers'])
+    dangling = sorted(record['id'] for record in records if record['dangling'])
+    return {
+        'used': used,
+        'unused': unused,
+        'dangling': dangling,
+        'images': records,
+        'counts': {'images': len(records), 'containers': len(containers),
+                   'used': len(used), 'unused': len(unused), 'dangling': len(dangling)},
+    }
+
+
+def get_image_usage(module, executable='podman'):
+    """Build the image usage map from one container listing and one image listing."""
+    containers = run_json(module, [executable, "ps", "-a", "--format", "json"])
+    images = run_json(module, [executable, "images", "--format", "json"])
+    return build_usage(images, containers)
+
+
+def main():
+    """Main module function."""
+    module_args = {
+        'executable': {'type': 'str', 'default': 'podman'}
+    }
+
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+
+    started = time.monotonic()
+    result = {'changed': False}
+    result.update(get_image_usage(module, module.params['executable']))
+    result['elapsed'] = round(time.monotonic() - started, 3)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -31,10 +31,35 @@ Author: System Administrator
 Date: 2025-07-18
 """
 
+import argparse
 import json
+import operator
+import re
+import sqlite3
 import sys
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Rule registry (YAML or JSON); see system_fix_rules.yml for the format
+RULES_FILE = os.getenv('SYSTEM_FIX_RULES',
+                       os.path.join(os.path.dirname(os.path.abspath(__file__)), 'system_fix_rules.yml'))
+
+# Fleet mode
+FLEET_WORKERS = int(os.getenv('FLEET_WORKERS', str(os.cpu_count() or 1))) # analysis processes
+FLEET_CHUNK = int(os.getenv('FLEET_CHUNK', '200')) # records sent to a worker at a time
+READ_SIZE = 1 << 16 # characters read from the export at a time
+HOST_WRAPPER_KEYS = ("data", "results") # keys an export may wrap its host records in
+
+# History of analysis results (SQLite)
+HISTORY_DB = os.getenv('SYSTEM_FIXES_DB', os.path.expanduser('~/.local/share/system_fixes/history.db'))
+
 # Colors for output
 RED = '\033[0;31m'
 GREEN = '\033[0;32m'
@@ -42,209 +67,1210 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m' # No Color
 
+# Result list each severity is reported under
+SEVERITY_BUCKETS = {
+    "critical": "critical_issues",
+    "warning": "warnings",
+    "info": "recommendations",
+}
+
+# Parts of a rule's remediation, in the order generate_fix_commands renders them
+REMEDIATION_KEYS = ("checks", "remove", "install", "restart", "enable", "commands")
+
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt,
+             ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+
 def print_url(url_text):
- """Print URL in blue color"""
- return f"{BLUE}{url_text}{NC}"
-
-def analyze_system_issues(data):
- """
- Analyze system issues from insights data
- 
- Args:
- data (dict): JSON data containing system insights
- 
- Returns:
- dict: Analysis results with recommendations
- """
- results = {
- "critical_issues": [],
- "warnings": [],
- "recommendations": [],
- "summary": {}
- }
- 
- print(" Analyzing system issues from insights data...")
- 
- if not isinstance(data, dict) or "details" not in data:
- results["critical_issues"].append("Invalid data format - missing 'details' key")
- return results
- 
- details = data.get("details", {})
- 
- # Analyze each issue
- for issue_key, issue_data in details.items():
- issue_type = issue_data.get("type", "unknown")
- error_key = issue_data.get("error_key", "")
- 
- print(f" Processing issue: {issue_key}")
- 
- # Handle specific issues
- if "ANSIBLE_ENGINE_TO_CORE_WARN" in error_key:
- results["warnings"].append({
- "issue": "Ansible Engine to Core Warning",
- "description": "Ansible Engine is deprecated, migrate to Ansible Core",
- "current_version": issue_data.get("ansible_ver", "unknown"),
- "rhel_version": issue_data.get("rhel_version", "unknown"),
- "recommendation": "Update to ansible-core package"
- })
- 
- elif "TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE" in error_key:
- results["critical_issues"].append({
- "issue": "Tuned Service Failed",
- "description": "Tuned service cannot start in graphical mode",
- "rhel_version": issue_data.get("rhel", "unknown"),
- "recommendation": "Check tuned service configuration and dependencies"
- })
- 
- elif "JDK_EOL_ERROR" in error_key:
- if "product" in issue_data:
- for product in issue_data["product"]:
- eol_date = product.get("eol", "")
- days_left = product.get("days", 0)
- 
- if days_left < 90: # Less than 90 days
- results["critical_issues"].append({
- "issue": "Java EOL Warning",
- "description": f"Java version approaching EOL in {days_left} days",
- "eol_date": eol_date,
- "product_name": product.get("name", "unknown"),
- "recommendation": "Plan Java version upgrade"
- })
- else:
- results["warnings"].append({
- "issue": "Java EOL Notice",
- "description": f"Java version will reach EOL in {days_left} days",
- "eol_date": eol_date,
- "product_name": product.get("name", "unknown"),
- "recommendation": "Monitor and plan for upgrade"
- })
- 
- # Generate summary
- results["summary"] = {
- "total_issues": len(details),
- "critical_count": len(results["critical_issues"]),
- "warning_count": len(results["warnings"]),
- "analysis_date": datetime.now().isoformat()
- }
- 
- return results
-
-def generate_fix_commands(results):
- """
- Generate shell commands to fix identified issues
- 
- Args:
- results (dict): Analysis results
- 
- Returns:
- list: List of shell commands to execute
- """
- commands = []
- 
- print("\n Generating fix commands...")
- 
- # Generate commands for each issue
- for issue in results["critical_issues"]:
- if "Ansible Engine to Core" in issue["issue"]:
- commands.append("# Fix Ansible Engine to Core issue")
- commands.append("sudo dnf remove ansible")
- commands.append("sudo dnf install ansible-core")
- commands.append("ansible-galaxy collection install ansible.posix")
- 
- elif "Tuned Service Failed" in issue["issue"]:
- commands.append("# Fix Tuned service issue")
- commands.append("sudo systemctl status tuned")
- commands.append("sudo systemctl restart tuned")
- commands.append("sudo systemctl enable tuned")
- 
- elif "Java EOL Warning" in issue["issue"]:
- commands.append("# Address Java EOL issue")
- commands.append("java -version")
- commands.append("sudo dnf list installed | grep java")
- commands.append("sudo dnf install java-11-openjdk java-11-openjdk-devel")
- 
- return commands
+    """Print URL in blue color"""
+    return f"{BLUE}{url_text}{NC}"
+
+class RuleError(ValueError):
+    """A rule in the registry is malformed"""
+
+class _Unknown(dict):
+    def __missing__(self, key):
+        return "unknown"
+
+class Rule:
+    """
+    One registry entry: how to report a finding and how to fix it
+
+    Args:
+        spec (dict): Rule as written in the registry file
+    """
+
+    def __init__(self, spec):
+        self.error_key = spec.get("error_key")
+        self.pattern = spec.get("pattern")
+        if bool(self.error_key) == bool(self.pattern):
+            raise RuleError(f"Rule needs exactly one of error_key or pattern: {spec}")
+        self.name = self.error_key or self.pattern
+        self.each = spec.get("each")
+        self.base = self._variant(spec)
+        self.escalation = None
+        self.escalate_when = None
+        if spec.get("escalate"):
+            escalate = dict(spec["escalate"])
+            match = CONDITION_PATTERN.match(str(escalate.pop("when", "")))
+            if not match:
+                raise RuleError(f"Rule {self.name}: escalate needs a condition like 'days < 90'")
+            field, op, value = match.groups()
+            self.escalate_when = (field, OPERATORS[op], float(value))
+            # Anything the escalation does not override comes from the rule itself
+            self.escalation = self._variant({**spec, "remediation": None, **escalate})
+        self.remediations = {(variant["issue"], variant["severity"]): variant["remediation"]
+                             for variant in (self.base, self.escalation) if variant}
+
+    def _variant(self, spec):
+        severity = spec.get("severity", "warning")
+        if severity not in SEVERITY_BUCKETS:
+            raise RuleError(f"Rule {self.name}: unknown severity '{severity}'")
+        remediation = spec.get("remediation") or {}
+        unknown = set(remediation) - set(REMEDIATION_KEYS) - {"comment"}
+        if unknown:
+            raise RuleError(f"Rule {self.name}: unknown remediation keys {sorted(unknown)}")
+        return {
+            "severity": severity,
+            "issue": spec.get("issue", self.name),
+            "description": spec.get("description", ""),
+            "fields": dict(spec.get("fields") or {}),
+            "recommendation": spec.get("recommendation", ""),
+            "remediation": dict({key: list(remediation.get(key) or []) for key in REMEDIATION_KEYS},
+                                comment=remediation.get("comment", f"Fix {spec.get('issue', self.name)}"))
+                           if remediation else None,
+        }
+
+    def findings(self, issue_data, error_key):
+        """Findings this rule reports for one Insights detail entry"""
+        if self.each:
+            items = issue_data.get(self.each) or []
+        else:
+            items = [issue_data]
+        findings = []
+        for item in items:
+            variant = self.base
+            if self.escalation:
+                field, compare, value = self.escalate_when
+                try:
+                    if compare(float(item.get(field, 0)), value):
+                        variant = self.escalation
+                except (TypeError, ValueError):
+                    pass
+            values = _Unknown(item)
+            finding = {
+                "issue": variant["issue"],
+                "description": variant["description"].format_map(values),
+            }
+            for name, key in variant["fields"].items():
+                finding[name] = item.get(key, "unknown")
+            finding["recommendation"] = variant["recommendation"]
+            finding["error_key"] = error_key
+            finding["severity"] = variant["severity"]
+            findings.append(finding)
+        return findings
+
+    def remediation(self, finding):
+        """Comment and commands fixing a finding this rule reported, or None"""
+        return self.remediations.get((finding.get("issue"), finding.get("severity")))
+
+def _numbered_group_reference(pattern):
+    """The first reference to a group by number in pattern (\\1 or (?(1)...)), or None"""
+    i, in_class = 0, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            digits = re.match(r"[0-9]*", pattern[i + 1:i + 4]).group()
+            # \0 and three octal digits are character escapes, and so is anything inside a class
+            octal = digits.startswith("0") or (len(digits) == 3 and max(digits) <= "7")
+            if digits and not octal and not in_class:
+                return "\\" + digits[:2]
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after "[" or "[^" is a literal
+            i += 1
+            if pattern[i:i + 1] == "^":
+                i += 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            continue
+        elif pattern.startswith("(?(", i):
+            match = re.match(r"\(\?\(\d+\)", pattern[i:])
+            if match:
+                return match.group(0)
+        i += 1
+    return None
+
+class RuleRegistry:
+    """
+    Rules indexed by exact error_key, with pattern rules as the fallback
+
+    Exact rules are found with one dict lookup. Pattern rules are compiled
+    into a single alternation tried once per unknown error_key, and the
+    answer is remembered, so the cost per finding does not grow with the
+    number of rules. Each pattern sits in a group of its own in the
+    alternation, which shifts the numbers of its groups, so patterns may not
+    refer to groups by number (or use named groups).
+    """
+
+    def __init__(self, specs):
+        self.exact = {}
+        self.patterns = []
+        for spec in specs:
+            rule = Rule(spec)
+            if rule.error_key:
+                if rule.error_key in self.exact:
+                    raise RuleError(f"Duplicate rule for error_key {rule.error_key}")
+                self.exact[rule.error_key] = rule
+            else:
+                try:
+                    if re.compile(rule.pattern).groupindex:
+                        raise RuleError(f"Rule pattern {rule.pattern} must not use named groups")
+                    reference = _numbered_group_reference(rule.pattern)
+                    if reference:
+                        raise RuleError(f"Rule pattern {rule.pattern} must not refer to a group by number"
+                                        f" ({reference}), as its groups are renumbered")
+                    # Some patterns only fail inside the alternation, such as global flags not at the start
+                    re.compile(f"(?:)|(?P<r0>{rule.pattern})")
+                except re.error as e:
+                    raise RuleError(f"Rule pattern {rule.pattern} is not a valid expression: {e}") from e
+                self.patterns.append(rule)
+        self.combined = None
+        if self.patterns:
+            try:
+                self.combined = re.compile("|".join(f"(?P<r{i}>{rule.pattern})"
+                                                    for i, rule in enumerate(self.patterns)))
+            except re.error as e:
+                raise RuleError(f"Pattern rules cannot be combined: {e}") from e
+        self.resolved = {}
+
+    def __len__(self):
+        return len(self.exact) + len(self.patterns)
+
+    def lookup(self, error_key):
+        """Rule for error_key, or None when no rule matches"""
+        rule = self.exact.get(error_key)
+        if rule is not None or self.combined is None:
+            return rule
+        if error_key not in self.resolved:
+            match = self.combined.match(error_key)
+            self.resolved[error_key] = self.patterns[int(match.lastgroup[1:])] if match else None
+        return self.resolved[error_key]
+
+def load_rules(path=RULES_FILE):
+    """
+    Load the rule registry from a YAML or JSON file
+
+    Args:
+        path (str): Registry file; a list of rules or a mapping with a 'rules' list
+
+    Returns:
+        RuleRegistry: The indexed rules
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yml", ".yaml")):
+            if yaml is None:
+                raise RuleError(f"PyYAML is needed to read {path}; install it or use a JSON rules file")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    specs = data.get("rules", []) if isinstance(data, dict) else data
+    return RuleRegistry(specs or [])
+
+_default_registry = None
+
+def default_registry():
+    """Registry from RULES_FILE, loaded on first use"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = load_rules(RULES_FILE)
+    return _default_registry
+
+def analyze_system_issues(data, registry=None, verbose=True):
+    """
+    Analyze system issues from insights data
+
+    Args:
+        data (dict): JSON data containing system insights
+        registry (RuleRegistry): Rules to apply (default: the rules in RULES_FILE)
+        verbose (bool): Print progress for each issue
+
+    Returns:
+        dict: Analysis results with recommendations
+    """
+    registry = registry or default_registry()
+    results = {
+        "critical_issues": [],
+        "warnings": [],
+        "recommendations": [],
+        "summary": {}
+    }
+
+    if verbose:
+        print(" Analyzing system issues from insights data...")
+
+    if not isinstance(data, dict) or "details" not in data:
+        results["critical_issues"].append("Invalid data format - missing 'details' key")
+        return results
+
+    details = data.get("details", {})
+    unmatched = 0
+
+    # Analyze each issue
+    for issue_key, issue_data in details.items():
+        # Detail keys look like "rule_module|ERROR_KEY" when the entry has no error_key of its own
+        error_key = issue_data.get("error_key") or issue_key.rpartition("|")[2]
+
+        if verbose:
+            print(f" Processing issue: {issue_key}")
+
+        rule = registry.lookup(error_key)
+        if rule is None:
+            unmatched += 1
+            continue
+        for finding in rule.findings(issue_data, error_key):
+            results[SEVERITY_BUCKETS[finding["severity"]]].append(finding)
+
+    # Generate summary
+    results["summary"] = {
+        "total_issues": len(details),
+        "critical_count": len(results["critical_issues"]),
+        "warning_count": len(results["warnings"]),
+        "unmatched_count": unmatched,
+        "analysis_date": datetime.now().isoformat()
+    }
+
+    return results
+
+def render_remediation(remediation):
+    """Shell commands carrying out one remediation"""
+    commands = list(remediation["checks"])
+    if remediation["remove"]:
+        commands.append("sudo dnf remove " + " ".join(remediation["remove"]))
+    if remediation["install"]:
+        commands.append("sudo dnf install " + " ".join(remediation["install"]))
+    commands.extend(f"sudo systemctl restart {service}" for service in remediation["restart"])
+    commands.extend(f"sudo systemctl enable {service}" for service in remediation["enable"])
+    commands.extend(remediation["commands"])
+    return commands
+
+def generate_fix_commands(results, registry=None, verbose=True):
+    """
+    Generate shell commands to fix identified issues
+
+    Args:
+        results (dict): Analysis results
+        registry (RuleRegistry): Rules the results were produced with (default: the rules in RULES_FILE)
+        verbose (bool): Print a progress line
+
+    Returns:
+        list: List of shell commands to execute
+    """
+    registry = registry or default_registry()
+    commands = []
+
+    if verbose:
+        print("\n Generating fix commands...")
+
+    # Generate commands for each issue whose rule declares a remediation
+    for bucket in ("critical_issues", "warnings", "recommendations"):
+        for issue in results.get(bucket, []):
+            if not isinstance(issue, dict):
+                continue
+            rule = registry.lookup(issue.get("error_key", ""))
+            remediation = rule.remediation(issue) if rule else None
+            if remediation:
+                commands.append(f"# {remediation['comment']}")
+                commands.extend(render_remediation(remediation))
+
+    return commands
+
+# === FLEET MODE ===
+class _JSONReader:
+    """Incremental reader over a text stream of JSON values"""
+
+    WHITESPACE = re.compile(r"[ \t\r\n]*")
+    SEPARATORS = re.compile(r"[ \t\r\n,]*")
+    NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+    def __init__(self, stream, read_size=READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer, self.pos, self.eof = "", 0, False
+
+    def fill(self, size):
+        """Append up to size characters to the unconsumed part of the buffer; False at the end of input"""
+        chunk = self.stream.read(size)
+        self.buffer, self.pos, self.eof = self.buffer[self.pos:] + chunk, 0, not chunk
+        return bool(chunk)
+
+    def peek(self, skip=WHITESPACE):
+        """Next character after anything skip matches, or None at the end of input"""
+        while True:
+            self.pos = skip.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof or not self.fill(self.read_size):
+                return None
+
+    def expect(self, char, skip=WHITESPACE):
+        if self.peek(skip) != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value, reading until it is complete"""
+        if self.peek() is None:
+            raise json.JSONDecodeError("Expecting value", self.buffer, self.pos)
+        size = self.read_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number that runs to the end of the buffer may continue in the next read
+                if self.eof or type(value) not in (int, float) or not self.NUMBER_TAIL.match(self.buffer, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Read twice as much each time, so a large value is decoded in a few passes rather than one per read
+            self.fill(size)
+            size *= 2
+
+    def array(self):
+        """Yield the elements of the array at the current position one at a time"""
+        self.expect("[")
+        while True:
+            char = self.peek(self.SEPARATORS)
+            if char is None:
+                raise json.JSONDecodeError("Unterminated array", self.buffer, self.pos)
+            if char == "]":
+                self.pos += 1
+                return
+            yield self.value()
+
+    def wrapped(self, keys):
+        """
+        Yield the object at the current position, or the elements of the array it wraps
+
+        The object is a wrapper when one of keys holds an array and comes
+        before any "details" key. That array is streamed element by element
+        and the object's other members are dropped; any other object is
+        decoded member by member and yielded whole.
+        """
+        self.expect("{")
+        record, wrapped = {}, False
+        while True:
+            char = self.peek(self.SEPARATORS)
+            if char is None:
+                raise json.JSONDecodeError("Unterminated object", self.buffer, self.pos)
+            if char == "}":
+                self.pos += 1
+                break
+            key = self.value()
+            self.expect(":")
+            if key in keys and not wrapped and "details" not in record and self.peek() == "[":
+                wrapped = True
+                yield from self.array()
+            else:
+                record[key] = self.value()
+        if not wrapped:
+            yield record
+
+def iter_json_records(stream, read_size=READ_SIZE, wrapper_keys=()):
+    """
+    Yield the records of a JSON export one at a time without reading it all
+
+    Accepts a top-level JSON array, NDJSON (one record per line) or records
+    simply written one after another. When the export starts with an object
+    that wraps its records in an array under one of wrapper_keys, that array
+    is streamed the same way as a top-level one. Only the record being
+    decoded is held in memory.
+    """
+    reader = _JSONReader(stream, read_size)
+    char = reader.peek()
+    if char == "[":
+        yield from reader.array()
+    elif char == "{" and wrapper_keys:
+        yield from reader.wrapped(wrapper_keys)
+    while reader.peek() is not None:
+        yield reader.value()
+
+def iter_host_records(stream):
+    """
+    Yield host records from an Insights export
+
+    Exports that wrap their hosts in an object ({"data": [...]} or
+    {"results": [...]}) are unwrapped. The hosts of a wrapper that starts the
+    export are streamed; later wrappers (such as one page per line) are
+    decoded whole.
+    """
+    for record in iter_json_records(stream, wrapper_keys=HOST_WRAPPER_KEYS):
+        if isinstance(record, dict) and "details" not in record:
+            hosts = record.get("data", record.get("results"))
+            if isinstance(hosts, list):
+                yield from hosts
+                continue
+        yield record
+
+def host_rhel_version(record):
+    """RHEL version of a host record, from the record, its system profile or its findings"""
+    version = record.get("rhel_version") or (record.get("system_profile") or {}).get("os_release")
+    if not version:
+        for data in (record.get("details") or {}).values():
+            if isinstance(data, dict):
+                version = data.get("rhel_version") or data.get("rhel")
+                if version:
+                    break
+    return str(version) if version else "unknown"
+
+def analyze_host(record, registry):
+    """
+    Analyze one host record down to what the fleet summary needs
+
+    Returns:
+        dict: insights_id, rhel_version, findings as (error_key, severity, issue)
+              tuples, and whether the record was invalid
+    """
+    if not isinstance(record, dict):
+        return {"insights_id": "unknown", "hostname": "unknown", "rhel_version": "unknown",
+                "findings": [], "invalid": True}
+    results = analyze_system_issues(record, registry, verbose=False)
+    findings = [(finding["error_key"], finding["severity"], finding["issue"])
+                for bucket in SEVERITY_BUCKETS.values()
+                for finding in results[bucket] if isinstance(finding, dict)]
+    insights_id = record.get("insights_id") or record.get("id") or "unknown"
+    return {
+        "insights_id": insights_id,
+        "hostname": record.get("fqdn") or record.get("display_name") or insights_id,
+        "rhel_version": host_rhel_version(record),
+        "findings": findings,
+        "invalid": "details" not in record,
+    }
+
+_worker_registry = None
+
+def _init_worker(rules_path):
+    global _worker_registry
+    _worker_registry = load_rules(rules_path)
+
+def _analyze_chunk(records):
+    return [analyze_host(record, _worker_registry) for record in records]
+
+def iter_chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def analyze_fleet(records, rules_path=RULES_FILE, workers=FLEET_WORKERS, chunk_size=FLEET_CHUNK):
+    """
+    Analyze host records across worker processes, yielding per-host results in input order
+
+    At most two chunks per worker are in flight, so memory stays flat however
+    long the input is.
+    """
+    if workers <= 1:
+        registry = load_rules(rules_path)
+        for record in records:
+            yield analyze_host(record, registry)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules_path,)) as pool:
+        pending = deque()
+        for chunk in iter_chunks(records, chunk_size):
+            pending.append(pool.submit(_analyze_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+class FleetSummary:
+    """Issue counts by error_key and hosts grouped by RHEL version and finding"""
+
+    def __init__(self):
+        self.hosts = 0
+        self.invalid = 0
+        self.issue_counts = Counter()
+        self.severity_counts = Counter()
+        self.version_counts = Counter()
+        self.hosts_by_version = defaultdict(lambda: defaultdict(list))
+
+    def add(self, host):
+        self.hosts += 1
+        if host["invalid"]:
+            self.invalid += 1
+        version = host["rhel_version"]
+        self.version_counts[version] += 1
+        seen = set()
+        for error_key, severity, issue in host["findings"]:
+            self.issue_counts[error_key] += 1
+            self.severity_counts[severity] += 1
+            if error_key not in seen:
+                seen.add(error_key)
+                self.hosts_by_version[version][error_key].append(host["insights_id"])
+
+    def to_dict(self):
+        return {
+            "hosts": self.hosts,
+            "invalid_records": self.invalid,
+            "issues_by_error_key": dict(self.issue_counts.most_common()),
+            "issues_by_severity": dict(self.severity_counts),
+            "hosts_by_rhel_version": dict(self.version_counts.most_common()),
+            "hosts_by_rhel_version_and_finding": {
+                version: {error_key: hosts for error_key, hosts in sorted(findings.items())}
+                for version, findings in sorted(self.hosts_by_version.items())
+            },
+        }
+
+REMEDIATION_PLAYBOOK = """---
+# Generated by Python_System_Fixes.py --plan-dir: applies the merged Insights
+# remediations to every host in the fixset_* groups of inventory.yml. Each
+# group's fix_* variables hold the merged fixes of its hosts; package removals
+# and installs run as one dnf transaction per host.
+- name: Apply merged Insights remediations
+  hosts: fixsets
+  become: true
+  gather_facts: false
+
+  tasks:
+    - name: Remove and install packages in one dnf transaction
+      ansible.builtin.shell: |
+        dnf -y shell <<'EOF'
+        remove {{ fix_remove | join(' ') }}
+        install {{ fix_install | join(' ') }}
+        run
+        EOF
+      when: fix_remove | length > 0 and fix_install | length > 0
+
+    - name: Install packages
+      ansible.builtin.dnf:
+        name: "{{ fix_install }}"
+        state: present
+      when: fix_install | length > 0 and fix_remove | length == 0
+
+    - name: Remove packages
+      ansible.builtin.dnf:
+        name: "{{ fix_remove }}"
+        state: absent
+      when: fix_remove | length > 0 and fix_install | length == 0
+
+    - name: Restart services
+      ansible.builtin.systemd_service:
+        name: "{{ item }}"
+        state: restarted
+      loop: "{{ fix_restart }}"
+
+    - name: Enable services
+      ansible.builtin.systemd_service:
+        name: "{{ item }}"
+        enabled: true
+      loop: "{{ fix_enable }}"
+
+    - name: Run remaining fix commands
+      ansible.builtin.shell: "{{ item }}"
+      loop: "{{ fix_commands }}"
+"""
+
+def merge_remediations(remediations):
+    """
+    Merge the remediations of one host into a single fix set
+
+    Packages are collected into one removal and one installation (a package
+    that is also installed is not removed), services and commands are
+    deduplicated in order, and checks are left out.
+    """
+    merged = {key: [] for key in REMEDIATION_KEYS if key != "checks"}
+    for remediation in remediations:
+        for key in merged:
+            for value in remediation[key]:
+                if value not in merged[key]:
+                    merged[key].append(value)
+    merged["install"].sort()
+    merged["remove"] = sorted(set(merged["remove"]) - set(merged["install"]))
+    return merged
+
+class FleetPlanner:
+    """
+    Group hosts that need the same merged fixes
+
+    Every host's remediations are merged into one fix set; hosts with equal
+    fix sets share a group, so a fleet run applies each distinct fix set once
+    per group instead of once per host and finding. Hosts are keyed by name:
+    a host listed more than once in the export gets the union of its
+    findings and lands in exactly one group.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.hosts = {}
+
+    def add(self, host):
+        fixable = {}
+        for error_key, severity, issue in host["findings"]:
+            rule = self.registry.lookup(error_key)
+            remediation = rule.remediation({"issue": issue, "severity": severity}) if rule else None
+            if remediation:
+                fixable[(error_key, severity, issue)] = remediation
+        if not fixable:
+            return
+        entry = self.hosts.setdefault(host["hostname"], {"insights_id": host["insights_id"], "findings": {}})
+        entry["findings"].update(fixable)
+
+    @property
+    def findings_with_fixes(self):
+        return sum(len(entry["findings"]) for entry in self.hosts.values())
+
+    def plan(self):
+        """Groups named fixset_001, ... from the most hosts to the fewest"""
+        groups = {}
+        for hostname, entry in self.hosts.items():
+            fixes = merge_remediations(entry["findings"].values())
+            group = groups.setdefault(json.dumps(fixes, sort_keys=True),
+                                      {"fixes": fixes, "error_keys": set(), "hosts": []})
+            group["error_keys"] |= {error_key for error_key, _, _ in entry["findings"]}
+            group["hosts"].append((hostname, entry["insights_id"]))
+        ordered = sorted(groups.values(), key=lambda group: len(group["hosts"]), reverse=True)
+        return {f"fixset_{i:03d}": group for i, group in enumerate(ordered, 1)}
+
+    def write(self, plan_dir):
+        """
+        Write inventory.yml, remediate.yml and plan.json into plan_dir
+
+        Returns:
+            dict: Hosts, groups and dnf transaction counts of the plan
+        """
+        os.makedirs(plan_dir, exist_ok=True)
+        plan = self.plan()
+        children = {}
+        for name, group in plan.items():
+            fix_vars = {f"fix_{key}": value for key, value in group["fixes"].items()}
+            fix_vars["fix_error_keys"] = sorted(group["error_keys"])
+            children[name] = {
+                "hosts": {hostname: {"insights_id": insights_id} for hostname, insights_id in group["hosts"]},
+                "vars": fix_vars,
+            }
+        inventory = {"all": {"children": {"fixsets": {"children": children}}}}
+        with open(os.path.join(plan_dir, "inventory.yml"), "w") as f:
+            if yaml is not None:
+                yaml.safe_dump(inventory, f, sort_keys=False, default_flow_style=False)
+            else:
+                # JSON is valid YAML
+                json.dump(inventory, f, indent=2)
+        with open(os.path.join(plan_dir, "remediate.yml"), "w") as f:
+            f.write(REMEDIATION_PLAYBOOK)
+
+        hosts = sum(len(group["hosts"]) for group in plan.values())
+        transactions = sum(len(group["hosts"]) for group in plan.values()
+                           if group["fixes"]["install"] or group["fixes"]["remove"])
+        stats = {
+            "hosts": hosts,
+            "fix_sets": len(plan),
+            "findings_with_fixes": self.findings_with_fixes,
+            "dnf_transactions": transactions,
+            "groups": {name: {"hosts": len(group["hosts"]), "error_keys": sorted(group["error_keys"]),
+                              **group["fixes"]} for name, group in plan.items()},
+        }
+        with open(os.path.join(plan_dir, "plan.json"), "w") as f:
+            json.dump(stats, f, indent=2)
+        return stats
+
+# === FINDINGS HISTORY ===
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    run_time REAL NOT NULL,
+    source TEXT,
+    hosts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (run_time);
+
+-- Every finding of every analyzed host, per run
+CREATE TABLE IF NOT EXISTS findings (
+    insights_id TEXT NOT NULL,
+    error_key TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    severity TEXT,
+    issue TEXT,
+    count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (insights_id, error_key, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id, error_key);
+
+-- One row per stretch of runs in which a host kept a finding; resolved_at is
+-- the time of the first run of that host without it
+CREATE TABLE IF NOT EXISTS spans (
+    insights_id TEXT NOT NULL,
+    error_key TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    resolved_at REAL,
+    severity TEXT,
+    PRIMARY KEY (insights_id, error_key, first_seen)
+) WITHOUT ROWID;
+-- Covering indexes for each change query, with and without an error_key filter
+CREATE INDEX IF NOT EXISTS spans_first_seen ON spans (first_seen, error_key);
+CREATE INDEX IF NOT EXISTS spans_key_first_seen ON spans (error_key, first_seen);
+CREATE INDEX IF NOT EXISTS spans_resolved ON spans (resolved_at, error_key) WHERE resolved_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS spans_key_resolved ON spans (error_key, resolved_at) WHERE resolved_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS spans_open ON spans (insights_id) WHERE resolved_at IS NULL;
+CREATE INDEX IF NOT EXISTS spans_key_open ON spans (error_key, first_seen, resolved_at) WHERE resolved_at IS NULL;
+
+-- Hosts and findings per error_key for each run, kept for trend queries
+CREATE TABLE IF NOT EXISTS run_counts (
+    run_id INTEGER NOT NULL,
+    error_key TEXT NOT NULL,
+    hosts INTEGER NOT NULL,
+    findings INTEGER NOT NULL,
+    PRIMARY KEY (run_id, error_key)
+) WITHOUT ROWID;
+"""
+
+# WHERE clause selecting each kind of change relative to a point in time
+CHANGE_QUERIES = {
+    "new": "first_seen >= :since",
+    "resolved": "resolved_at >= :since",
+    "persisting": "resolved_at IS NULL AND first_seen < :since",
+}
+
+SEVERITY_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+def parse_since(value, now=None):
+    """
+    Turn '7d', '12h', '30m', '90s' or an ISO date/time into seconds since the epoch
+
+    Raises:
+        ValueError: If value is neither
+    """
+    now = time.time() if now is None else now
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([dhms])", value.strip())
+    if match:
+        amount, unit = float(match.group(1)), match.group(2)
+        return now - amount * {"d": 86400, "h": 3600, "m": 60, "s": 1}[unit]
+    return datetime.fromisoformat(value).timestamp()
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp is not None else None
+
+class FindingsStore:
+    """
+    Indexed history of analysis results
+
+    Each run records the findings of the hosts it analyzed, keyed by
+    insights_id, error_key and run. Alongside the raw rows the store keeps a
+    span per continuous stretch in which a host had a finding, so new,
+    resolved and persisting findings are single index range scans rather
+    than diffs between runs. Runs must be recorded in time order.
+
+    Args:
+        path (str): SQLite database file, created if missing
+    """
+
+    def __init__(self, path=HISTORY_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(HISTORY_SCHEMA)
+        self.run = None
+
+    def start_run(self, source=None, run_time=None):
+        """Begin recording a run; returns its run_id"""
+        run_time = time.time() if run_time is None else run_time
+        latest = self.db.execute("SELECT MAX(run_time) FROM runs").fetchone()[0]
+        if latest is not None and run_time <= latest:
+            raise ValueError(f"Run time {format_time(run_time)} is not after the latest run {format_time(latest)}")
+        cursor = self.db.execute("INSERT INTO runs (run_time, source) VALUES (?, ?)", (run_time, source))
+        self.run = {"id": cursor.lastrowid, "time": run_time, "hosts": 0, "seen": set(), "skipped": 0,
+                    "hosts_by_key": Counter(), "findings_by_key": Counter()}
+        return self.run["id"]
+
+    def record_host(self, host):
+        """
+        Record one host's findings (as returned by analyze_host) in the current run
+
+        A host that appears more than once in a run gets the union of its
+        records' findings. Invalid records and records without an
+        insights_id or id cannot be tracked across runs and are skipped.
+
+        Returns:
+            bool: False when the record was skipped
+        """
+        run_id, run_time = self.run["id"], self.run["time"]
+        insights_id = host["insights_id"]
+        if host["invalid"] or insights_id == "unknown":
+            self.run["skipped"] += 1
+            return False
+        current = {}
+        for error_key, severity, issue in host["findings"]:
+            entry = current.get(error_key)
+            if entry is None:
+                current[error_key] = [severity, issue, 1]
+            else:
+                entry[2] += 1
+                if SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(entry[0], 0):
+                    entry[0], entry[1] = severity, issue
+
+        # Keys an earlier record of this host already recorded in this run
+        repeated = insights_id in self.run["seen"]
+        recorded = set()
+        if repeated:
+            recorded = {row[0] for row in self.db.execute(
+                "SELECT error_key FROM findings WHERE insights_id = ? AND run_id = ?", (insights_id, run_id))}
+
+        open_spans = dict(self.db.execute(
+            "SELECT error_key, first_seen FROM spans WHERE insights_id = ? AND resolved_at IS NULL",
+            (insights_id,)))
+        self.db.executemany(
+            "UPDATE spans SET last_seen = ?, severity = ? WHERE insights_id = ? AND error_key = ? AND first_seen = ?",
+            [(run_time, current[key][0], insights_id, key, first_seen)
+             for key, first_seen in open_spans.items() if key in current])
+        if not repeated:
+            self.db.executemany(
+                "UPDATE spans SET resolved_at = ? WHERE insights_id = ? AND error_key = ? AND first_seen = ?",
+                [(run_time, insights_id, key, first_seen)
+                 for key, first_seen in open_spans.items() if key not in current])
+        for key, entry in current.items():
+            if key in open_spans:
+                continue
+            # A repeated record may carry a finding the host's first record of this run resolved
+            if repeated and self.db.execute(
+                    "UPDATE spans SET resolved_at = NULL, last_seen = ?, severity = ?"
+                    " WHERE insights_id = ? AND error_key = ? AND resolved_at = ?",
+                    (run_time, entry[0], insights_id, key, run_time)).rowcount:
+                continue
+            self.db.execute(
+                "INSERT INTO spans (insights_id, error_key, first_seen, last_seen, severity) VALUES (?, ?, ?, ?, ?)",
+                (insights_id, key, run_time, run_time, entry[0]))
+        self.db.executemany(
+            "INSERT INTO findings (insights_id, error_key, run_id, severity, issue, count) VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (insights_id, error_key, run_id) DO UPDATE SET count = count + excluded.count",
+            [(insights_id, key, run_id, *entry) for key, entry in current.items()])
+
+        if not repeated:
+            self.run["seen"].add(insights_id)
+            self.run["hosts"] += 1
+        for key, entry in current.items():
+            if key not in recorded:
+                self.run["hosts_by_key"][key] += 1
+            self.run["findings_by_key"][key] += entry[2]
+        return True
+
+    def finish_run(self):
+        """Store the run's per-error_key counts and commit it; returns the run_id and the number of skipped records"""
+        run = self.run
+        self.db.execute("UPDATE runs SET hosts = ? WHERE run_id = ?", (run["hosts"], run["id"]))
+        self.db.executemany(
+            "INSERT INTO run_counts (run_id, error_key, hosts, findings) VALUES (?, ?, ?, ?)",
+            [(run["id"], key, hosts, run["findings_by_key"][key]) for key, hosts in run["hosts_by_key"].items()])
+        self.db.commit()
+        self.run = None
+        return run["id"], run["skipped"]
+
+    def _where(self, kind, error_key=None):
+        if kind not in CHANGE_QUERIES:
+            raise ValueError(f"Unknown change '{kind}', expected one of {', '.join(CHANGE_QUERIES)}")
+        where = CHANGE_QUERIES[kind]
+        if error_key:
+            where += " AND error_key = :error_key"
+        return where
+
+    def changes(self, kind, since, error_key=None, limit=None):
+        """
+        New, resolved or persisting findings relative to since (seconds since the epoch)
+
+        Returns:
+            list: One dict per host and error_key, newest first
+        """
+        order = "resolved_at" if kind == "resolved" else "first_seen"
+        sql = (f"SELECT insights_id, error_key, severity, first_seen, last_seen, resolved_at FROM spans"
+               f" WHERE {self._where(kind, error_key)} ORDER BY {order} DESC")
+        if limit:
+            sql += " LIMIT :limit"
+        rows = self.db.execute(sql, {"since": since, "error_key": error_key, "limit": limit})
+        return [{"insights_id": row[0], "error_key": row[1], "severity": row[2], "first_seen": format_time(row[3]),
+                 "last_seen": format_time(row[4]), "resolved_at": format_time(row[5])} for row in rows]
+
+    def change_counts(self, kind, since, error_key=None):
+        """Number of hosts per error_key with a new, resolved or persisting finding"""
+        sql = (f"SELECT error_key, COUNT(*) FROM spans WHERE {self._where(kind, error_key)}"
+               f" GROUP BY error_key ORDER BY COUNT(*) DESC")
+        return dict(self.db.execute(sql, {"since": since, "error_key": error_key}))
+
+    def trend(self, since=None, error_key=None):
+        """
+        Hosts affected per run and error_key
+
+        Returns:
+            list: (run time, hosts analyzed, error_key, affected hosts, findings) tuples, oldest first
+        """
+        sql = ("SELECT r.run_time, r.hosts, c.error_key, c.hosts, c.findings FROM runs r"
+               " JOIN run_counts c ON c.run_id = r.run_id WHERE r.run_time >= :since")
+        if error_key:
+            sql += " AND c.error_key = :error_key"
+        sql += " ORDER BY r.run_time, c.hosts DESC"
+        rows = self.db.execute(sql, {"since": since or 0, "error_key": error_key})
+        return [(format_time(row[0]), *row[1:]) for row in rows]
+
+    def close(self):
+        if self.run is not None:
+            self.db.rollback()
+        # Keeps the planner's statistics current as the store grows
+        self.db.execute("PRAGMA optimize")
+        self.db.close()
+
+def report_history(args):
+    """Print new, resolved or persisting findings, or the trend, from the history store"""
+    store = FindingsStore(history_path(args))
+    try:
+        since = parse_since(args.since)
+        if args.report == "trend":
+            print(f"\n Trend since {format_time(since)}:")
+            for run_time, hosts, error_key, affected, findings in store.trend(since, args.error_key):
+                print(f" {run_time} {affected:8d}/{hosts:<8d} hosts {findings:8d} findings {error_key}")
+            return
+        counts = store.change_counts(args.report, since, args.error_key)
+        print(f"\n {args.report.capitalize()} findings since {format_time(since)}: {sum(counts.values())}")
+        for error_key, count in counts.items():
+            print(f" {count:8d} {error_key}")
+        if args.limit:
+            print()
+            for row in store.changes(args.report, since, args.error_key, args.limit):
+                when = row["resolved_at"] if args.report == "resolved" else row["first_seen"]
+                print(f" {when} {row['insights_id']} {row['error_key']} ({row['severity']})")
+    finally:
+        store.close()
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be measured"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_fleet(args):
+    """Analyze an Insights export and print and save the fleet summary"""
+    summary = FleetSummary()
+    planner = FleetPlanner(load_rules(args.rules)) if args.plan_dir else None
+    history = history_path(args)
+    store = None
+    if history:
+        store = FindingsStore(history)
+        store.start_run(source=args.input)
+    started = time.perf_counter()
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        for host in analyze_fleet(iter_host_records(stream), args.rules, args.workers, args.chunk_size):
+            summary.add(host)
+            if planner:
+                planner.add(host)
+            if store:
+                store.record_host(host)
+            if summary.hosts % 10000 == 0:
+                rate = summary.hosts / (time.perf_counter() - started)
+                print(f" {summary.hosts} hosts analyzed ({rate:,.0f} hosts/s)")
+        if store:
+            _, skipped = store.finish_run()
+            if skipped:
+                print(f" Warning: {skipped} invalid records or records without an insights_id"
+                      f" were not recorded in the history")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if store:
+            store.close()
+    elapsed = time.perf_counter() - started
+
+    report = summary.to_dict()
+    print("\n Fleet Summary:")
+    print(f" Hosts: {summary.hosts} ({summary.invalid} invalid records)")
+    for version, count in summary.version_counts.most_common():
+        print(f" RHEL {version}: {count} hosts")
+    print("\n Issues by error_key:")
+    for error_key, count in summary.issue_counts.most_common(20):
+        print(f" {count:8d} {error_key}")
+
+    # The history store replaces the timestamped dumps; --output still writes one
+    if args.output or not store:
+        output_file = args.output or f"/tmp/fleet_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n Fleet summary saved to: {output_file}")
+
+    if planner:
+        stats = planner.write(args.plan_dir)
+        print(f"\n Remediation plan: {stats['hosts']} hosts in {stats['fix_sets']} fix sets,"
+              f" {stats['dnf_transactions']} dnf transactions for {stats['findings_with_fixes']} fixable findings")
+        print(f" Run it with: ansible-playbook -i {os.path.join(args.plan_dir, 'inventory.yml')}"
+              f" {os.path.join(args.plan_dir, 'remediate.yml')}")
+
+    if store:
+        print(f"\n Findings recorded in: {history}")
+
+    rate = summary.hosts / elapsed if elapsed else 0.0
+    peak = peak_rss_mb()
+    print(f" Analyzed {summary.hosts} hosts in {elapsed:.1f}s ({rate:,.0f} hosts/s, {args.workers} workers"
+          + (f", peak RSS {peak:.0f} MB)" if peak is not None else ")"))
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze and fix system issues from JSON insights data")
+    parser.add_argument("--rules", default=RULES_FILE, help="rule registry, YAML or JSON (default: %(default)s)")
+    parser.add_argument("--input", metavar="FILE",
+                        help="Insights export (JSON array, {\"data\": [...]} wrapper or NDJSON, '-' for stdin) to analyze as a fleet")
+    parser.add_argument("--workers", type=int, default=FLEET_WORKERS, help="analysis processes in fleet mode")
+    parser.add_argument("--chunk-size", type=int, default=FLEET_CHUNK, help="records per worker task")
+    parser.add_argument("--output", help="also save the fleet summary to this file"
+                                         " (with --no-history: /tmp/fleet_summary_<timestamp>.json)")
+    parser.add_argument("--plan-dir", help="write a merged remediation plan (inventory.yml, remediate.yml,"
+                                           " plan.json) for the fleet into this directory")
+    parser.add_argument("--history",
+                        help=f"SQLite store the findings of every --input run are recorded in (default: {HISTORY_DB});"
+                             " the built-in sample is only recorded when this is given")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run")
+    parser.add_argument("--report", choices=["new", "resolved", "persisting", "trend"],
+                        help="query the history store instead of analyzing")
+    parser.add_argument("--since", default="7d",
+                        help="start of the reported period: 7d, 12h, 30m, 90s or an ISO date (default: %(default)s)")
+    parser.add_argument("--error-key", help="limit the report to one error_key")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="list up to this many findings after the counts (0 for counts only)")
+    return parser.parse_args(argv)
+
+def history_path(args):
+    """History store for fleet runs and reports, or None with --no-history"""
+    return None if args.no_history else args.history or HISTORY_DB
 
 def main():
- """Main function to run the system fixes analysis"""
- print(" Python System Fixes - ${COMPANY_NAME} Insights Analysis")
- print("=" * 50)
- 
- # Sample input JSON data
- sample_data = {
- "id": "af935949-db8d-4b5a-ab99-6ec39f2ecb01",
- "insights_id": "93a83f9a-5781-4270-aee5-1ca8dc00760e",
- "details": {
- "ansible_engine_to_core|ANSIBLE_ENGINE_TO_CORE_WARN": {
- "type": "rule",
- "error_key": "ANSIBLE_ENGINE_TO_CORE_WARN",
- "ansible_ver": "ansible-7.7.0-1.el9",
- "rhel_version": "9.6"
- },
- "tuned_failed_to_start_in_graphical_mode|TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE": {
- "rhel": "9.6",
- "type": "rule",
- "error_key": "TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE"
- },
- "openjdk_eol|JDK_EOL_ERROR": {
- "type": "rule",
- "brief": {
- "${COMPANY_NAME} build of OpenJDK": f"{BLUE}https://access.${{COMPANY_DOMAIN}}/articles/1299013{NC}"
- },
- "product": [
- {
- "eol": "2024-10-31",
- "days": 251,
- "name": "${COMPANY_NAME} build of OpenJDK",
- "phase": "Full Support",
- "policy": f"{BLUE}https://access.${{COMPANY_DOMAIN}}/articles/1299013{NC}",
- "version": "11.0.22+7"
- }
- ]
- }
- }
- }
- 
- # Run analysis
- try:
- results = analyze_system_issues(sample_data)
- 
- # Display results
- print("\n Analysis Results:")
- print(f" Total Issues: {results['summary']['total_issues']}")
- print(f" Critical Issues: {results['summary']['critical_count']}")
- print(f" Warnings: {results['summary']['warning_count']}")
- 
- # Display critical issues
- if results["critical_issues"]:
- print("\n Critical Issues:")
- for issue in results["critical_issues"]:
- print(f" • {issue['issue']}: {issue['description']}")
- print(f" Recommendation: {issue['recommendation']}")
- 
- # Display warnings
- if results["warnings"]:
- print("\n Warnings:")
- for warning in results["warnings"]:
- print(f" • {warning['issue']}: {warning['description']}")
- print(f" Recommendation: {warning['recommendation']}")
- 
- # Generate and display fix commands
- fix_commands = generate_fix_commands(results)
- if fix_commands:
- print("\n Suggested Fix Commands:")
- for cmd in fix_commands:
- print(f" {cmd}")
- 
- # Save results to file
- output_file = f"/tmp/system_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
- with open(output_file, 'w') as f:
- json.dump(results, f, indent=2)
- print(f"\n Analysis saved to: {output_file}")
- 
- except Exception as e:
- print(f" Error during analysis: {str(e)}")
- sys.exit(1)
+    """Main function to run the system fixes analysis"""
+    args = parse_args()
+    print(" Python System Fixes - ${COMPANY_NAME} Insights Analysis")
+    print("=" * 50)
+
+    if args.report:
+        if args.no_history:
+            print(" --report needs a history store")
+            sys.exit(1)
+        try:
+            report_history(args)
+        except (sqlite3.Error, ValueError) as e:
+            print(f" Error reading history: {e}")
+            sys.exit(1)
+        return
+
+    try:
+        registry = load_rules(args.rules)
+    except (OSError, ValueError) as e:
+        print(f" Cannot load rules from {args.rules}: {e}")
+        sys.exit(1)
+
+    if args.input:
+        try:
+            run_fleet(args)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f" Error during fleet analysis: {e}")
+            sys.exit(1)
+        return
+
+    # Sample input JSON data
+    sample_data = {
+        "id": "af935949-db8d-4b5a-ab99-6ec39f2ecb01",
+        "insights_id": "93a83f9a-5781-4270-aee5-1ca8dc00760e",
+        "details": {
+            "ansible_engine_to_core|ANSIBLE_ENGINE_TO_CORE_WARN": {
+                "type": "rule",
+                "error_key": "ANSIBLE_ENGINE_TO_CORE_WARN",
+                "ansible_ver": "ansible-7.7.0-1.el9",
+                "rhel_version": "9.6"
+            },
+            "tuned_failed_to_start_in_graphical_mode|TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE": {
+                "rhel": "9.6",
+                "type": "rule",
+                "error_key": "TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE"
+            },
+            "openjdk_eol|JDK_EOL_ERROR": {
+                "type": "rule",
+                "brief": {
+                    "${COMPANY_NAME} build of OpenJDK": f"{BLUE}https://access.${{COMPANY_DOMAIN}}/articles/1299013{NC}"
+                },
+                "product": [
+                    {
+                        "eol": "2024-10-31",
+                        "days": 251,
+                        "name": "${COMPANY_NAME} build of OpenJDK",
+                        "phase": "Full Support",
+                        "policy": f"{BLUE}https://access.${{COMPANY_DOMAIN}}/articles/1299013{NC}",
+                        "version": "11.0.22+7"
+                    }
+                ]
+            }
+        }
+    }
+
+    # Run analysis
+    try:
+        results = analyze_system_issues(sample_data, registry)
+
+        # Display results
+        print("\n Analysis Results:")
+        print(f" Total Issues: {results['summary']['total_issues']}")
+        print(f" Critical Issues: {results['summary']['critical_count']}")
+        print(f" Warnings: {results['summary']['warning_count']}")
+
+        # Display critical issues
+        if results["critical_issues"]:
+            print("\n Critical Issues:")
+            for issue in results["critical_issues"]:
+                print(f" • {issue['issue']}: {issue['description']}")
+                print(f" Recommendation: {issue['recommendation']}")
+
+        # Display warnings
+        if results["warnings"]:
+            print("\n Warnings:")
+            for warning in results["warnings"]:
+                print(f" • {warning['issue']}: {warning['description']}")
+                print(f" Recommendation: {warning['recommendation']}")
+
+        # Generate and display fix commands
+        fix_commands = generate_fix_commands(results, registry)
+        if fix_commands:
+            print("\n Suggested Fix Commands:")
+            for cmd in fix_commands:
+                print(f" {cmd}")
+
+        # Record the sample only in an explicitly chosen store, so it never mixes with real hosts
+        if args.history and not args.no_history:
+            store = FindingsStore(args.history)
+            try:
+                store.start_run(source="sample")
+                store.record_host(analyze_host(sample_data, registry))
+                store.finish_run()
+            finally:
+                store.close()
+            print(f"\n Findings recorded in: {args.history}")
+        else:
+            output_file = f"/tmp/system_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(output_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n Analysis saved to: {output_file}")
+
+    except Exception as e:
+        print(f" Error during analysis: {str(e)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
- main()
+    main()
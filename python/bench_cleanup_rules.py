@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script: bench_cleanup_rules.py
+Purpose: Measure the MB/s of the compiled cleanup rules from
+         clean_files_properly.py, whole-text and streamed, against the
+         chain of re.sub and str.replace calls they replaced, on synthetic
+         Python/Markdown text with emoji, hard-coded paths and extra whitespace
+"""
+
+import argparse
+import io
+import random
+import re
+import time
+
+from clean_files_properly import DEFAULT_RULES
+
+
+def legacy_clean_file_content(content):
+    """The previous clean_file_content: one pass over the whole text per pattern and literal"""
+    emoji_patterns = [
+        r'[▶️⏸️⏹️⏭️⏮️]',
+        r'[⬆️⬇️⬅️️↗️↘️↙️↖️]'
+    ]
+    for pattern in emoji_patterns:
+        content = re.sub(pattern, '', content)
+    content = content.replace('/home/sgallego/Downloads/GIT/rando/BusinessToolsBrowser', '.')
+    content = content.replace('/home/sgallego/Downloads/GIT/BusinessToolsBrowser', '.')
+    content = content.replace('/home/sgallego/Downloads/GIT/rando/python/BusinessTools', '.')
+    content = content.replace('Red_Hat_Tools_For_SA_SSP_and_Managers.xlsx', '*.xlsx')
+    content = re.sub(r' +', ' ', content)
+    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    return content
+
+
+LINES = [
+    "def process(path):\n",
+    "    \"\"\"Load the workbook and return its rows\"\"\"\n",
+    "    rows = load('/home/sgallego/Downloads/GIT/BusinessToolsBrowser/data/Red_Hat_Tools_For_SA_SSP_and_Managers.xlsx')\n",
+    "    return [row  for row in rows if row]\n",
+    "## 🚀 Quick Start\n",
+    "- ✅ Installation  complete ⬆️\n",
+    "Plain documentation text that no rule touches, the common case in a real tree.\n",
+    "Plain documentation text that no rule touches, the common case in a real tree.\n",
+    "Plain documentation text that no rule touches, the common case in a real tree.\n",
+    "\n",
+    "\n",
+    "\n",
+]
+
+
+def build_text(size_mb, ascii_only=False, seed=42):
+    rng = random.Random(seed)
+    choices = [line for line in LINES if line.isascii()] if ascii_only else LINES
+    lines, size = [], 0
+    while size < size_mb * 1024 ** 2:
+        line = rng.choice(choices)
+        lines.append(line)
+        size += len(line.encode("utf-8"))
+    return "".join(lines)
+
+
+def measure(name, function, text, size_mb, repeat):
+    best = min(timed(function, text) for _ in range(repeat))
+    print(f" {name:28s} {best:7.3f}s {size_mb / best:8.1f} MB/s")
+    return best
+
+
+def timed(function, text):
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=float, default=32, help="MB of text to clean")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant (the best is reported)")
+    args = parser.parse_args()
+
+    for name, ascii_only in (("with emoji", False), ("ASCII only", True)):
+        text = build_text(args.size, ascii_only)
+        clean_text = DEFAULT_RULES.clean(text)
+        size_mb = len(text.encode("utf-8")) / 1024 ** 2
+        print(f"\n {size_mb:.1f} MB of text {name}, {len(text.splitlines())} lines")
+
+        legacy = measure("legacy re.sub/replace chain", legacy_clean_file_content, text, size_mb, args.repeat)
+        whole = measure("compiled rules, whole text", DEFAULT_RULES.clean, text, size_mb, args.repeat)
+        stream = measure("compiled rules, streamed",
+                         lambda text: DEFAULT_RULES.clean_stream(io.StringIO(text, newline=""), io.StringIO()),
+                         text, size_mb, args.repeat)
+        measure("compiled rules, already clean", DEFAULT_RULES.clean, clean_text, size_mb, args.repeat)
+        print(f" Speedup over legacy: {legacy / whole:.1f}x whole text, {legacy / stream:.1f}x streamed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Script: bench_findings_store.py
+Purpose: Time the findings history store from Python_System_Fixes.py: record
+         several runs of a synthetic fleet whose findings appear and resolve
+         between runs, then time the new/resolved/persisting and trend queries
+         on the filled store
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from Python_System_Fixes import FindingsStore
+
+
+def fleet_run(hosts, keys, per_host, churn, previous, rng):
+    """Findings per host for one run, changing a share of the previous run's findings"""
+    current = {}
+    for host in range(hosts):
+        findings = previous.get(host)
+        if findings is None or rng.random() < churn:
+            findings = rng.sample(keys, per_host)
+        current[host] = findings
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=50000, help="hosts in the fleet")
+    parser.add_argument("--runs", type=int, default=5, help="runs to record")
+    parser.add_argument("--per-host", type=int, default=4, help="findings per host and run")
+    parser.add_argument("--keys", type=int, default=200, help="distinct error_keys")
+    parser.add_argument("--churn", type=float, default=0.1, help="share of hosts whose findings change per run")
+    parser.add_argument("--db", help="store to fill (default: a temporary file)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    keys = [f"RULE_{i}_KEY" for i in range(args.keys)]
+    path = args.db or os.path.join(tempfile.mkdtemp(), "history.db")
+    store = FindingsStore(path)
+
+    # One run a day, ending now
+    start_time = time.time() - (args.runs - 1) * 86400
+    previous = {}
+    recorded = 0
+    started = time.perf_counter()
+    for run in range(args.runs):
+        previous = fleet_run(args.hosts, keys, args.per_host, args.churn, previous, rng)
+        store.start_run(source=f"bench-{run}", run_time=start_time + run * 86400)
+        for host, findings in previous.items():
+            store.record_host({"insights_id": f"host-{host}",
+                               "findings": [(key, "warning", key) for key in findings], "invalid": False})
+        store.finish_run()
+        recorded += args.hosts * args.per_host
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path) / 1024 ** 2
+    print(f" Recorded {recorded} findings ({args.runs} runs x {args.hosts} hosts) in {elapsed:.1f}s"
+          f" ({recorded / elapsed:,.0f} findings/s), store {size:.0f} MB")
+
+    since = time.time() - 1.5 * 86400
+    queries = [
+        ("new, counts", lambda: store.change_counts("new", since)),
+        ("resolved, counts", lambda: store.change_counts("resolved", since)),
+        ("persisting, counts", lambda: store.change_counts("persisting", since)),
+        ("new, one error_key", lambda: store.changes("new", since, keys[0])),
+        ("persisting, newest 100", lambda: store.changes("persisting", since, limit=100)),
+        ("trend, all runs", lambda: store.trend()),
+        ("trend, one error_key", lambda: store.trend(error_key=keys[0])),
+    ]
+    for name, query in queries:
+        started = time.perf_counter()
+        rows = query()
+        elapsed = time.perf_counter() - started
+        print(f" {name:24s} {elapsed * 1000:8.1f} ms {len(rows):8d} rows")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
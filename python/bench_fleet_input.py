@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script: bench_fleet_input.py
+Purpose: Time and measure the memory of reading a synthetic Insights export
+         with iter_host_records from Python_System_Fixes.py, written as a
+         flat JSON array, as NDJSON and wrapped in {"data": [...]}. Checks
+         that every layout yields the same hosts and that the wrapped export
+         streams like a flat one, and exits non-zero when a check fails
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Python_System_Fixes import iter_host_records
+
+
+def make_host(i):
+    return {
+        "insights_id": f"host-{i}",
+        "system_profile": {"os_release": "8.10"},
+        "details": {
+            "m|ANSIBLE_ENGINE_TO_CORE_WARN": {"type": "rule", "error_key": "ANSIBLE_ENGINE_TO_CORE_WARN",
+                                              "rhel": "8.10", "ansible_ver": "ansible-7"},
+            f"openjdk_eol|JDK_{i % 4}": {"type": "rule", "error_key": f"JDK_{i % 4}",
+                                         "packages": [f"java-1.8.0-openjdk-{i}"], "days": i % 365},
+        },
+    }
+
+
+def write_exports(directory, hosts):
+    """Write the hosts in each layout and return {layout: path}"""
+    paths = {layout: os.path.join(directory, f"{layout}.json") for layout in ("flat", "ndjson", "wrapped")}
+    with open(paths["flat"], "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(make_host(i)) for i in range(hosts)) + "\n]\n")
+    with open(paths["ndjson"], "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(make_host(i)) + "\n" for i in range(hosts))
+    with open(paths["wrapped"], "w", encoding="utf-8") as f:
+        f.write('{"meta": {"count": %d}, "data": [\n' % hosts)
+        f.write(",\n".join(json.dumps(make_host(i)) for i in range(hosts)))
+        f.write('\n], "links": {"next": null}}\n')
+    return paths
+
+
+def read_export(path):
+    """Read every host, returning the count and the first and last host"""
+    count, first, last = 0, None, None
+    with open(path, encoding="utf-8") as f:
+        for host in iter_host_records(f):
+            count += 1
+            first = first or host
+            last = host
+    return count, first, last
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=40000, help="hosts in the export")
+    args = parser.parse_args()
+
+    failed = []
+
+    def check(passed, description):
+        print(f" {'PASS' if passed else 'FAIL'} {description}")
+        if not passed:
+            failed.append(description)
+
+    expected = (args.hosts, make_host(0), make_host(args.hosts - 1))
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_exports(directory, args.hosts)
+        timings, peaks = {}, {}
+        for layout, path in paths.items():
+            start = time.perf_counter()
+            result = read_export(path)
+            timings[layout] = time.perf_counter() - start
+            tracemalloc.start()
+            read_export(path)
+            peaks[layout] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            tracemalloc.stop()
+            size = os.path.getsize(path) / 1024 ** 2
+            print(f" {layout:>8}: {size:6.1f} MB in {timings[layout]:6.2f}s"
+                  f" ({args.hosts / timings[layout]:,.0f} hosts/s), peak {peaks[layout]:5.1f} MB allocated")
+            check(result == expected, f"{layout} yields every host")
+
+    # Generous bounds: a wrapper decoded whole takes many times longer and holds the whole export
+    check(timings["wrapped"] < 2 * timings["flat"] + 0.5, "the wrapped export reads as fast as the flat one")
+    check(peaks["wrapped"] < 2 * peaks["flat"] + 1, "the wrapped export is streamed, not held in memory")
+
+    if failed:
+        print(f" {len(failed)} checks failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
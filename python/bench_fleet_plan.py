@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script: bench_fleet_plan.py
+Purpose: Time the remediation planner from Python_System_Fixes.py on a
+         synthetic fleet in which a share of the hosts is listed twice with
+         different findings, as exports merged from several sources are.
+         Checks that every host lands in exactly one fix set with the union
+         of its findings, and exits non-zero when a check fails
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from Python_System_Fixes import FleetPlanner, analyze_host, default_registry
+
+DETAILS = {
+    "m|ANSIBLE_ENGINE_TO_CORE_WARN": {"type": "rule", "error_key": "ANSIBLE_ENGINE_TO_CORE_WARN",
+                                      "rhel": "8.10", "ansible_ver": "ansible-7"},
+    "m|TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE": {
+        "type": "rule", "error_key": "TUNED_SERVICE_CANNOT_START_UNDER_GRAPHIC_TARGET_MODE", "rhel": "8.10"},
+    "openjdk_eol|JDK_EOL_ERROR": {"type": "rule",
+                                  "product": [{"eol": "2025-01-01", "days": 230, "name": "OpenJDK"}]},
+}
+
+
+def make_record(i, rng):
+    """One host with a random, non-empty subset of the findings; a JDK finding only has a fix when escalated"""
+    keys = rng.sample(sorted(DETAILS), rng.randint(1, len(DETAILS)))
+    details = {key: DETAILS[key] for key in keys}
+    if "openjdk_eol|JDK_EOL_ERROR" in details:
+        details["openjdk_eol|JDK_EOL_ERROR"] = {
+            "type": "rule", "product": [{"eol": "2025-01-01", "days": rng.randint(30, 400), "name": "OpenJDK"}]}
+    return {"insights_id": f"id-{i}", "fqdn": f"host{i}.example.com", "details": details}
+
+
+def fixable_keys(host, registry):
+    """error_keys of the host's findings that have a remediation"""
+    keys = set()
+    for error_key, severity, issue in host["findings"]:
+        rule = registry.lookup(error_key)
+        if rule and rule.remediation({"issue": issue, "severity": severity}):
+            keys.add(error_key)
+    return keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=50000, help="distinct hosts in the fleet")
+    parser.add_argument("--repeated", type=float, default=0.1, help="share of hosts listed a second time")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    registry = default_registry()
+    records = [make_record(i, rng) for i in range(args.hosts)]
+    records += [make_record(i, rng) for i in rng.sample(range(args.hosts), int(args.hosts * args.repeated))]
+    rng.shuffle(records)
+    hosts = [analyze_host(record, registry) for record in records]
+
+    # The error_keys each host should be planned for, over all of its records
+    expected = {}
+    for host in hosts:
+        keys = fixable_keys(host, registry)
+        if keys:
+            expected.setdefault(host["hostname"], set()).update(keys)
+
+    planner = FleetPlanner(registry)
+    start = time.perf_counter()
+    for host in hosts:
+        planner.add(host)
+    plan = planner.plan()
+    elapsed = time.perf_counter() - start
+    print(f" Planned {len(records)} records of {args.hosts} hosts into {len(plan)} fix sets in {elapsed:.2f}s"
+          f" ({len(records) / elapsed:,.0f} records/s)")
+
+    failed = []
+
+    def check(passed, description):
+        print(f" {'PASS' if passed else 'FAIL'} {description}")
+        if not passed:
+            failed.append(description)
+
+    placed = {}
+    for name, group in plan.items():
+        for hostname, _ in group["hosts"]:
+            placed.setdefault(hostname, []).append(name)
+    check(placed.keys() == expected.keys(), "every host with a fixable finding is planned")
+    check(all(len(names) == 1 for names in placed.values()), "every host is in exactly one fix set")
+    check(all(expected[hostname] <= plan[names[0]]["error_keys"] for hostname, names in placed.items()),
+          "every host's fix set covers the findings of all its records")
+
+    if failed:
+        print(f" {len(failed)} checks failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Script: bench_html_conversion.py
+Purpose: Compare the previous BeautifulSoup + html2text conversion with the single-parse
+         PageConverter from Download_And_Convert_HTML_To_Markdown.py, reporting time and
+         peak memory per MB of HTML input. With lxml installed, also checks that the
+         lxml and html.parser backends convert every fixture and a set of edge cases to
+         the same Markdown, and exits non-zero when they differ
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import html2text
+from bs4 import BeautifulSoup
+
+import Download_And_Convert_HTML_To_Markdown as converter_module
+from Download_And_Convert_HTML_To_Markdown import PageConverter, fill_placeholders
+
+
+def build_fixture(sections):
+    """A documentation-style page with navigation, scripts, tables, images and links"""
+    nav = "<nav><ul>" + "".join(f'<li><a href="/docs/{i}.html">Chapter {i}</a></li>' for i in range(50)) + "</ul></nav>"
+    parts = [f"<html><head><title>Fixture</title><style>body {{ margin: 0 }}</style>"
+             f"<script>var analytics = {{}};</script></head><body>{nav}<h1>Guide</h1>"]
+    for i in range(sections):
+        parts.append(
+            f"<h2>Section {i}</h2><p>Paragraph with <b>bold</b>, <i>italic</i><!-- note {i} --> and a "
+            f'<a href="/docs/section{i}.html#top">cross reference</a> &mdash; &copy;&nbsp;Example.</p>'
+            f'<img src="/img/diagram{i % 40}.png" alt="Diagram {i}">'
+            "<table><tr><th>Option</th><th>Value</th></tr>"
+            + "".join(f"<tr><td>opt{j}</td><td>{j * i}</td></tr>" for j in range(5))
+            + "</table><pre><code>ansible-playbook site.yml -i inventory.ini</code></pre>"
+            "<script>track();</script>"
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+# Markup where the two backends are easy to tell apart
+EDGE_CASES = [
+    "<p>a <!-- c --> after comment</p>",
+    "<div><!-- c1 --><p>x</p><!-- c2 -->tail</div>",
+    "<p>a <?php echo 1 ?> after pi</p>",
+    "<ul><li>one<!-- x --></li><li>two</li></ul>",
+    "<p><b>bold</b><!--x--><i>it</i></p>",
+    "<p>&copy; 2024 &eacute;t&eacute; caf\u00e9 &mdash; x&nbsp;y z\u00a0w &amp; &lt;tag&gt; &#169; &#x2014;</p>",
+    "<p>&rsquo;quoted&rsquo; &hellip; &unknownentity; &#150;</p>",
+    "<pre>  code\u00a0 &amp; <!-- k --> more</pre>",
+    "<table><tr><td>a&nbsp;b</td><td>&copy;</td></tr></table>",
+    "<p>x</p><script>a<b</script><p>&#39;y&#39;</p>",
+]
+
+
+def convert_with(backend, html, url):
+    """Convert with the given backend, restoring the module's parser afterwards"""
+    lxml_html = converter_module.lxml_html
+    if backend == "html.parser":
+        converter_module.lxml_html = None
+    try:
+        return PageConverter(url).convert(html)
+    finally:
+        converter_module.lxml_html = lxml_html
+
+
+def check_backend_parity(paths, url):
+    """Names of the fixtures and edge cases the two backends convert differently"""
+    pages = [(os.path.basename(path), open(path, encoding="utf-8").read()) for path in paths]
+    pages += [(repr(html), html) for html in EDGE_CASES]
+    return [name for name, html in pages
+            if convert_with("html.parser", html, url) != convert_with("lxml", html, url)]
+
+
+def write_fixtures(directory):
+    for name, sections in (("small", 20), ("medium", 400), ("large", 4000)):
+        with open(os.path.join(directory, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(build_fixture(sections))
+    return sorted(glob.glob(os.path.join(directory, "*.html")))
+
+
+def convert_previous(html, url):
+    soup = BeautifulSoup(html, "html.parser")
+    for img in soup.find_all("img"):
+        img["src"] = "images/" + os.path.basename(img["src"])
+    return html2text.HTML2Text().handle(str(soup))
+
+
+def convert_single_parse(html, url):
+    converter = PageConverter(url)
+    markdown = converter.convert(html)
+    return fill_placeholders(markdown, converter, {u: "images/" + os.path.basename(u) for u in converter.images})
+
+
+def current_rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def measure(method, backend, path, results):
+    """Run one conversion in this (fresh) process and report time and peak RSS growth"""
+    if backend == "html.parser":
+        converter_module.lxml_html = None
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    baseline = current_rss_kb()
+    start = time.perf_counter()
+    method(html, "https://docs.example.com/guide/index.html")
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, max(peak - baseline, 0) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of .html files (default: generated fixtures)")
+    args = parser.parse_args()
+
+    workdir = None
+    if args.fixtures:
+        paths = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    else:
+        workdir = tempfile.mkdtemp()
+        paths = write_fixtures(workdir)
+
+    methods = [("previous (bs4 + html2text)", convert_previous, "html.parser"),
+               ("single parse, html.parser", convert_single_parse, "html.parser")]
+    if converter_module.lxml_html is not None:
+        methods.append(("single parse, lxml", convert_single_parse, "lxml"))
+
+    context = multiprocessing.get_context("spawn")
+    print(f" {'fixture':<12}{'MB':>7}  {'method':<28}{'s/MB':>8}{'peak MB/MB':>12}")
+    for path in paths:
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        for label, method, backend in methods:
+            results = context.Queue()
+            process = context.Process(target=measure, args=(method, backend, path, results))
+            process.start()
+            elapsed, peak_mb = results.get()
+            process.join()
+            print(f" {os.path.basename(path):<12}{size_mb:>7.2f}  {label:<28}"
+                  f"{elapsed / size_mb:>8.2f}{peak_mb / size_mb:>12.1f}")
+
+    mismatches = []
+    if converter_module.lxml_html is not None:
+        mismatches = check_backend_parity(paths, "https://docs.example.com/guide/index.html")
+        for name in mismatches:
+            print(f" FAIL lxml and html.parser convert {name} differently")
+        if not mismatches:
+            print(f" PASS lxml and html.parser agree on {len(paths)} fixtures and {len(EDGE_CASES)} edge cases")
+
+    if workdir:
+        for path in paths:
+            os.remove(path)
+        os.rmdir(workdir)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Script: bench_image_downloads.py
+Purpose: Compare sequential and concurrent image downloads from
+         Download_And_Convert_HTML_To_Markdown.py against a local image server
+"""
+
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from Download_And_Convert_HTML_To_Markdown import ImageStore, download_image_urls
+
+
+def make_handler(latency, image_size):
+    body = bytes(range(256)) * (image_size // 256 + 1)
+    body = body[:image_size]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def image_urls(base_url, count):
+    return [f"{base_url}/diagrams/figure_{i}.png" for i in range(count)]
+
+
+def download_sequentially(urls, folder):
+    """The previous approach: one un-pooled, fully buffered GET per image"""
+    for url in urls:
+        data = requests.get(url).content
+        with open(f"{folder}/{url.rsplit('/', 1)[-1]}", "wb") as f:
+            f.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=200, help="images on the page")
+    parser.add_argument("--size", type=int, default=256 * 1024, help="bytes per image")
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency in seconds")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent downloads")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, args.size))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = image_urls(f"http://127.0.0.1:{server.server_port}", args.images)
+    total_mb = args.images * args.size / (1024 * 1024)
+    print(f" {args.images} images of {args.size // 1024} KB ({total_mb:.1f} MB), {args.latency * 1000:.0f} ms latency")
+
+    workdir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        download_sequentially(urls, workdir)
+        elapsed = time.perf_counter() - start
+        print(f" Sequential: {elapsed:8.2f}s {total_mb / elapsed:8.1f} MB/s")
+
+        start = time.perf_counter()
+        downloaded = download_image_urls(urls, ImageStore(f"{workdir}/images"), max_workers=args.workers)
+        elapsed = time.perf_counter() - start
+        print(f" Concurrent: {elapsed:8.2f}s {total_mb / elapsed:8.1f} MB/s"
+              f" (workers={args.workers}, {len(downloaded)}/{args.images} images stored)")
+    finally:
+        shutil.rmtree(workdir)
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script: bench_keyword_rules.py
+Purpose: Compare the row-wise and vectorized keyword rules from polish_redhat_tools.py
+         on synthetic tool sheets
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from polish_redhat_tools import categorize, categorize_all, enhance_description, enhance_descriptions
+
+SAMPLE_SYNOPSES = [
+    "Web diagram editor for architecture maps",
+    "Hands-on labs for product learning",
+    "Token broker for SSO authentication",
+    "Live stream and video capture",
+    "Terminal recorder for demos",
+    "Git hosting for internal projects",
+    "Weekly meeting notes and conference bridges",
+    "Ansible automation content browser",
+    "Spreadsheet of partner contacts",
+    None,
+]
+
+
+def build_frame(rows, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "Name": [f"Tool {i}" for i in range(rows)],
+        "Synopsis": [rng.choice(SAMPLE_SYNOPSES) for _ in range(rows)],
+    })
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="sheet sizes to time")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = build_frame(rows)
+
+        row_synopsis, row_enhance = timed(lambda: df.apply(enhance_description, axis=1))
+        vec_synopsis, vec_enhance = timed(lambda: enhance_descriptions(df))
+
+        enhanced = df.assign(Enhanced_Synopsis=vec_synopsis)
+        row_category, row_categorize = timed(lambda: enhanced.apply(categorize, axis=1))
+        vec_category, vec_categorize = timed(lambda: categorize_all(enhanced["Enhanced_Synopsis"]))
+
+        same = (row_synopsis.astype(str).equals(vec_synopsis.astype(str))
+                and row_category.astype(str).equals(vec_category.astype(str)))
+        print(f" {rows:>9,} rows")
+        print(f"   enhance    row-wise {row_enhance:8.3f}s vectorized {vec_enhance:8.3f}s"
+              f" ({row_enhance / vec_enhance:5.1f}x)")
+        print(f"   categorize row-wise {row_categorize:8.3f}s vectorized {vec_categorize:8.3f}s"
+              f" ({row_categorize / vec_categorize:5.1f}x)")
+        print(f"   results identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Script: bench_podman_backends.py
+Purpose: Compare the podman_image_info command and REST API backends from
+         Display_Podman_Image_Information.py against local stand-ins: a small
+         unix-socket server speaking the libpod endpoints the module uses, and
+         a stand-in podman executable, so no real podman is needed. Also checks
+         that both backends return the same images, that auto falls back to the
+         command without a socket or when the API fails partway through a query,
+         and exits non-zero when a check fails
+"""
+
+import argparse
+import json
+import os
+import re
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
+
+from Display_Podman_Image_Information import APIBackend, CLIBackend, get_image_info, query_podman, select_backend
+
+STAND_IN_PODMAN = '''#!{python}
+import json, sys
+images = json.load(open({data!r}))
+args = sys.argv[1:]
+if args[:1] == ["images"]:
+    for option, value in zip(args, args[1:]):
+        if option == "--filter" and value.startswith("label="):
+            key, _, wanted = value[len("label="):].partition("=")
+            images = [image for image in images
+                      if key in image["Labels"] and (not wanted or image["Labels"][key] == wanted)]
+    print(json.dumps(images))
+elif args[:2] == ["image", "inspect"]:
+    by_id = {{image["Id"]: image for image in images}}
+    print(json.dumps([dict(by_id[arg], Architecture="amd64") for arg in args[4:]]))
+else:
+    sys.exit(125)
+'''
+
+
+def make_images(count):
+    return [{
+        "Id": f"{i:064x}",
+        "Names": [f"registry.example.com/app{i}:v{i}"],
+        "Created": 1700000000 + i * 3600,
+        "Size": 1000000 * (i + 1),
+        "Labels": {"component": f"app{i % 7}"},
+        "Containers": i % 3,
+    } for i in range(count)]
+
+
+def make_handler(images, faults):
+    """
+    Build a handler that answers the libpod endpoints used by the module.
+
+    Once faults["requests"] reaches faults["fail_after"], every request gets a
+    500, to break the API in the middle of a query.
+    """
+    by_id = {image["Id"]: image for image in images}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            faults["requests"] += 1
+            if faults["fail_after"] is not None and faults["requests"] > faults["fail_after"]:
+                self.send(b'{"message": "stand-in failure"}', status=500)
+                return
+            url = urlparse(self.path)
+            path = re.sub(r"^/v[\d.]+", "", url.path)
+            inspect = re.fullmatch(r"/libpod/images/([^/]+)/json", path)
+            if path == "/libpod/_ping":
+                self.send(b"OK", "text/plain")
+            elif path == "/libpod/images/json":
+                filters = json.loads(parse_qs(url.query).get("filters", ["{}"])[0])
+                selected = images
+                for label in filters.get("label", []):
+                    key, _, value = label.partition("=")
+                    selected = [image for image in selected
+                                if key in image["Labels"] and (not value or image["Labels"][key] == value)]
+                self.send(json.dumps(selected).encode())
+            elif inspect and unquote(inspect.group(1)) in by_id:
+                self.send(json.dumps(dict(by_id[unquote(inspect.group(1))], Architecture="amd64")).encode())
+            else:
+                self.send(b'{"message": "no such image"}', status=404)
+
+        def send(self, body, content_type="application/json", status=200):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self):
+            return "unix"
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class StandInModule:
+    """Just enough of AnsibleModule for the backends"""
+
+    def __init__(self, backend="auto"):
+        self.params = {"backend": backend}
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs)
+
+
+class Checks:
+    """Collect pass/fail results so every check runs before the exit status is set"""
+
+    def __init__(self):
+        self.failed = []
+
+    def check(self, passed, description):
+        print(f" {'PASS' if passed else 'FAIL'} {description}")
+        if not passed:
+            self.failed.append(description)
+
+
+def start_server(socket_path, images, faults):
+    server = socketserver.ThreadingUnixStreamServer(socket_path, make_handler(images, faults))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install_stand_in_podman(directory, images):
+    data = os.path.join(directory, "images.json")
+    with open(data, "w") as f:
+        json.dump(images, f)
+    podman = os.path.join(directory, "podman")
+    with open(podman, "w") as f:
+        f.write(STAND_IN_PODMAN.format(python=sys.executable, data=data))
+    os.chmod(podman, os.stat(podman).st_mode | stat.S_IXUSR)
+    os.environ["PATH"] = directory + os.pathsep + os.environ["PATH"]
+
+
+def time_queries(backend, queries, **options):
+    start = time.perf_counter()
+    for _ in range(queries):
+        images = get_image_info(backend, **options)
+    return time.perf_counter() - start, images
+
+
+def check_api_failure(checks, module, socket_path, faults, expected):
+    """Break the API after its listing request and check what each backend mode does"""
+    query = lambda backend: get_image_info(backend, details=True, filters=["label=component=app1"])
+    try:
+        api = APIBackend(socket_path)
+        faults["fail_after"] = faults["requests"] + 1
+        backend, detailed = query_podman(module, api, query)
+        checks.check(backend.name == "cli" and detailed == expected,
+                     "auto finishes with the command when the API fails partway through a query")
+
+        api = APIBackend(socket_path)
+        faults["fail_after"] = faults["requests"] + 1
+        try:
+            query_podman(StandInModule("api"), api, query)
+            checks.check(False, "backend=api fails when the API fails partway through a query")
+        except RuntimeError as e:
+            checks.check("Podman API request failed" in str(e),
+                         "backend=api fails when the API fails partway through a query")
+        finally:
+            api.close()
+    finally:
+        faults["fail_after"] = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=500, help="number of images in the stand-in store")
+    parser.add_argument("--queries", type=int, default=50, help="listing queries per backend")
+    parser.add_argument("--batch-size", type=int, default=200, help="inspect batch size for the command backend")
+    args = parser.parse_args()
+
+    images = make_images(args.images)
+    module = StandInModule()
+    checks = Checks()
+    faults = {"requests": 0, "fail_after": None}
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "podman.sock")
+        server = start_server(socket_path, images, faults)
+        install_stand_in_podman(directory, images)
+        try:
+            chosen = select_backend(module, "auto", socket_path)
+            checks.check(chosen.name == "api", "auto selects the API when its socket answers")
+            chosen.close()
+            missing = select_backend(module, "auto", os.path.join(directory, "missing.sock"))
+            checks.check(missing.name == "cli", "auto selects the command when the socket is missing")
+            try:
+                select_backend(module, "api", os.path.join(directory, "missing.sock"))
+                checks.check(False, "backend=api fails when the socket is missing")
+            except RuntimeError as e:
+                checks.check("Podman API is not available" in str(e), "backend=api fails when the socket is missing")
+
+            print(f" {args.images} images, {args.queries} listing queries")
+            cli, api = CLIBackend(module), APIBackend(socket_path)
+            results = {}
+            for backend in (cli, api):
+                elapsed, listed = time_queries(backend, args.queries)
+                print(f" {backend.name:>4} listing: {elapsed:7.2f}s {args.queries / elapsed:8.1f} queries/s")
+                elapsed, detailed = time_queries(backend, 1, details=True, batch_size=args.batch_size,
+                                                 filters=["label=component=app1"])
+                print(f" {backend.name:>4} details: {elapsed:7.2f}s for {len(detailed)} images")
+                results[backend.name] = (listed, detailed)
+            api.close()
+            checks.check(len(results["cli"][0]) == args.images, "the listing returns every image")
+            checks.check(results["cli"][0] == results["api"][0], "both backends return the same listing")
+            checks.check(results["cli"][1] == results["api"][1], "both backends return the same details")
+
+            check_api_failure(checks, module, socket_path, faults, results["cli"][1])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if checks.failed:
+        print(f" {len(checks.failed)} checks failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
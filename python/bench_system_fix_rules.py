@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Script: bench_system_fix_rules.py
+Purpose: Time the rule registry from Python_System_Fixes.py on a synthetic
+         registry (exact and pattern rules) and synthetic Insights findings,
+         against the substring if/elif chain the registry replaced
+"""
+
+import argparse
+import random
+import time
+
+from Python_System_Fixes import RuleRegistry, analyze_system_issues, generate_fix_commands
+
+
+def build_specs(rules, pattern_share):
+    """Exact rules RULE_<n>_KEY plus pattern rules matching FAMILY_<n>_*"""
+    patterns = int(rules * pattern_share)
+    specs = []
+    for i in range(rules - patterns):
+        specs.append({
+            "error_key": f"RULE_{i}_KEY",
+            "severity": "critical" if i % 5 == 0 else "warning",
+            "issue": f"Rule {i}",
+            "description": "Version {version} is affected",
+            "fields": {"rhel_version": "rhel"},
+            "recommendation": f"Apply fix {i}",
+            "remediation": {"commands": [f"sudo dnf install fix-{i}"]},
+        })
+    for i in range(patterns):
+        specs.append({
+            "pattern": f"FAMILY_{i}_",
+            "severity": "info",
+            "issue": f"Family {i}",
+            "recommendation": f"Review family {i}",
+        })
+    return specs, rules - patterns, patterns
+
+
+def build_hosts(findings, per_host, exact, patterns, seed=42):
+    """Hosts whose details reference random exact rules, pattern families and unknown keys"""
+    rng = random.Random(seed)
+    hosts = []
+    for host in range(findings // per_host):
+        details = {}
+        for j in range(per_host):
+            roll = rng.random()
+            if roll < 0.8 or not patterns:
+                key = f"RULE_{rng.randrange(exact)}_KEY"
+            elif roll < 0.95:
+                key = f"FAMILY_{rng.randrange(patterns)}_VARIANT_{rng.randrange(50)}"
+            else:
+                key = f"UNKNOWN_{rng.randrange(1000)}"
+            details[f"module_{j}|{key}"] = {"type": "rule", "error_key": key, "rhel": "9.6", "version": j}
+        hosts.append({"insights_id": f"host-{host}", "details": details})
+    return hosts
+
+
+def substring_chain(error_keys, rule_keys):
+    """The previous approach: test every rule with 'in' until one matches"""
+    matched = 0
+    for error_key in error_keys:
+        for rule_key in rule_keys:
+            if rule_key in error_key:
+                matched += 1
+                break
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10000, help="rules in the registry")
+    parser.add_argument("--findings", type=int, default=100000, help="findings to analyze")
+    parser.add_argument("--per-host", type=int, default=50, help="findings per host")
+    parser.add_argument("--pattern-share", type=float, default=0.05, help="share of rules that are patterns")
+    parser.add_argument("--chain-sample", type=int, default=2000,
+                        help="findings timed with the substring chain (the rest is extrapolated)")
+    args = parser.parse_args()
+
+    specs, exact, patterns = build_specs(args.rules, args.pattern_share)
+    start = time.perf_counter()
+    registry = RuleRegistry(specs)
+    print(f" Loaded {len(registry)} rules ({exact} exact, {patterns} patterns) in {time.perf_counter() - start:.2f}s")
+
+    hosts = build_hosts(args.findings, args.per_host, exact, patterns)
+    total = len(hosts) * args.per_host
+
+    start = time.perf_counter()
+    reported = commands = 0
+    for host in hosts:
+        results = analyze_system_issues(host, registry, verbose=False)
+        reported += sum(len(results[bucket]) for bucket in ("critical_issues", "warnings", "recommendations"))
+        commands += len(generate_fix_commands(results, registry, verbose=False))
+    elapsed = time.perf_counter() - start
+    print(f" Registry: {total} findings in {elapsed:.2f}s ({total / elapsed:,.0f} findings/s),"
+          f" {reported} reported, {commands} fix commands")
+
+    # Substring chain over the same rule keys (patterns as their literal prefix)
+    rule_keys = [spec.get("error_key") or spec["pattern"] for spec in specs]
+    error_keys = [data["error_key"] for host in hosts for data in host["details"].values()]
+    sample = error_keys[:args.chain_sample]
+    start = time.perf_counter()
+    substring_chain(sample, rule_keys)
+    elapsed = time.perf_counter() - start
+    estimate = elapsed / len(sample) * total
+    print(f" Substring chain: {len(sample)} findings in {elapsed:.2f}s ({len(sample) / elapsed:,.0f} findings/s),"
+          f" about {estimate:.0f}s for all {total} (matching only, no reporting)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script: bench_url_validation.py
+Purpose: Compare sequential and concurrent URL validation from polish_redhat_tools.py
+         against local stand-in HTTP servers with a configurable response latency
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from polish_redhat_tools import check_url, make_session, validate_urls
+
+
+def make_handler(latency):
+    """Build a request handler that sleeps for latency seconds before answering"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            time.sleep(latency)
+            # Paths under /forbidden and /missing mimic restricted and broken tools
+            if self.path.startswith("/forbidden"):
+                self.send_response(403)
+            elif self.path.startswith("/missing"):
+                self.send_response(404)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_servers(count, latency):
+    """Start count local servers; each one plays the part of a separate host"""
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def build_urls(servers, total):
+    urls = []
+    for i in range(total):
+        host, port = servers[i % len(servers)].server_address
+        path = "/forbidden" if i % 17 == 0 else "/missing" if i % 23 == 0 else "/tool"
+        urls.append(f"http://{host}:{port}{path}/{i}")
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=500, help="number of URLs to check")
+    parser.add_argument("--hosts", type=int, default=8, help="number of stand-in hosts")
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency in seconds")
+    parser.add_argument("--workers", type=int, default=32, help="concurrent checks overall")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent checks per host")
+    parser.add_argument("--skip-sequential", action="store_true", help="only time the concurrent path")
+    args = parser.parse_args()
+
+    servers = start_servers(args.hosts, args.latency)
+    urls = build_urls(servers, args.urls)
+    print(f" {args.urls} URLs across {args.hosts} hosts, {args.latency * 1000:.0f} ms latency")
+
+    try:
+        expected = None
+        if not args.skip_sequential:
+            session = make_session(1)
+            start = time.perf_counter()
+            expected = {url: check_url(url, session=session) for url in urls}
+            elapsed = time.perf_counter() - start
+            session.close()
+            print(f" Sequential: {elapsed:8.2f}s {len(urls) / elapsed:8.1f} URLs/s")
+
+        start = time.perf_counter()
+        statuses = validate_urls(urls, max_workers=args.workers, per_host=args.per_host)
+        elapsed = time.perf_counter() - start
+        print(f" Concurrent: {elapsed:8.2f}s {len(urls) / elapsed:8.1f} URLs/s"
+              f" (workers={args.workers}, per_host={args.per_host})")
+
+        if expected is not None and expected != statuses:
+            mismatched = sum(1 for url in urls if expected[url] != statuses[url])
+            print(f" Status mismatch on {mismatched} URLs")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
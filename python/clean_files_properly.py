@@ -1,66 +1,315 @@
 #!/usr/bin/env python3
+import argparse
+import fnmatch
 import os
 import re
-import glob
-
-def clean_file_content(content):
- # Remove emojis using regex patterns
- emoji_patterns = [
- r'[Quick StartProfessional ReportingDistribution-Specific Features[PASS][FAIL][WARNING]SearchRole VariablesSystemSystemInstallationNote:License]',
- r'[]',
- r'[▶️⏸️⏹️⏭️⏮️]',
- r'[⬆️⬇️⬅️️↗️↘️↙️↖️]'
- ]
- 
- for pattern in emoji_patterns:
- content = re.sub(pattern, '', content)
- 
- # Remove hard-coded paths
- content = content.replace('/home/sgallego/Downloads/GIT/rando/BusinessToolsBrowser', '.')
- content = content.replace('/home/sgallego/Downloads/GIT/BusinessToolsBrowser', '.')
- content = content.replace('/home/sgallego/Downloads/GIT/rando/python/BusinessTools', '.')
- 
- # Replace specific filename
- content = content.replace('Red_Hat_Tools_For_SA_SSP_and_Managers.xlsx', '*.xlsx')
- 
- # Clean up extra spaces
- content = re.sub(r' +', ' ', content)
- content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
- 
- return content
-
-# Process files
-for pattern in ['*.py', '*.sh', '*.md']:
- for filepath in glob.glob(pattern):
- if filepath.endswith('.backup'):
- continue
- print(f"Processing: {filepath}")
- try:
- with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
- content = f.read()
- cleaned = clean_file_content(content)
- with open(filepath, 'w', encoding='utf-8') as f:
- f.write(cleaned)
- print(f" Cleaned: {filepath}")
- except Exception as e:
- print(f" Error: {e}")
-
-# Process subdirectories
-for root, dirs, files in os.walk('.'):
- for file in files:
- if file.endswith(('.py', '.sh', '.md')) and not file.endswith('.backup'):
- filepath = os.path.join(root, file)
- if not filepath.startswith('./'):
- continue
- print(f"Processing: {filepath}")
- try:
- with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
- content = f.read()
- cleaned = clean_file_content(content)
- with open(filepath, 'w', encoding='utf-8') as f:
- f.write(cleaned)
- print(f" Cleaned: {filepath}")
- except Exception as e:
- print(f" Error: {e}")
-
-print("Cleanup complete!")
+import shutil
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+EXTENSIONS = ('.py', '.sh', '.md')
+# Directory and file names (glob patterns) never descended into or cleaned
+EXCLUDES = ['.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv', '.tox', '*.backup']
+CHUNK_SIZE = int(os.getenv('CLEAN_CHUNK_SIZE', '64'))  # Files handed to a worker at a time
+STREAM_THRESHOLD = int(os.getenv('CLEAN_STREAM_THRESHOLD', str(8 * 1024 ** 2)))  # Larger files are streamed
+STREAM_BLOCK = int(os.getenv('CLEAN_STREAM_BLOCK', str(1024 ** 2)))  # Characters of whole lines cleaned at a time when streaming
+
+# === CLEANUP RULES ===
+# Literal text -> replacement
+REPLACEMENTS = {
+    # Hard-coded paths
+    '/home/sgallego/Downloads/GIT/rando/BusinessToolsBrowser': '.',
+    '/home/sgallego/Downloads/GIT/BusinessToolsBrowser': '.',
+    '/home/sgallego/Downloads/GIT/rando/python/BusinessTools': '.',
+    # Specific filename
+    'Red_Hat_Tools_For_SA_SSP_and_Managers.xlsx': '*.xlsx',
+}
+
+# Code point ranges removed as emoji, with the spaces that follow them
+EMOJI_RANGES = [
+    (0x1F1E6, 0x1F1FF),  # Regional indicators (flags)
+    (0x1F300, 0x1F5FF),  # Symbols and pictographs, skin tone modifiers
+    (0x1F600, 0x1F64F),  # Emoticons
+    (0x1F680, 0x1F6FF),  # Transport and map symbols
+    (0x1F780, 0x1F7FF),  # Geometric shapes extended (colored circles and squares)
+    (0x1F900, 0x1F9FF),  # Supplemental symbols and pictographs
+    (0x1FA70, 0x1FAFF),  # Symbols and pictographs extended-A
+    (0x2600, 0x26FF),    # Miscellaneous symbols
+    (0x2700, 0x27BF),    # Dingbats
+    (0x2B00, 0x2BFF),    # Miscellaneous symbols and arrows
+    (0x23E9, 0x23FA),    # Media controls
+    (0x231A, 0x231B),    # Watch, hourglass
+    (0x2196, 0x2199),    # Diagonal arrows
+    (0x25B6, 0x25B6),    # Play button
+    (0x25C0, 0x25C0),    # Reverse button
+    (0x2139, 0x2139),    # Information source
+    (0x200D, 0x200D),    # Zero width joiner
+    (0x20E3, 0x20E3),    # Combining keycap
+    (0xFE0E, 0xFE0F),    # Variation selectors
+]
+
+# Runs of spaces after text collapse to one space (indentation is kept), and
+# runs of blank lines to one blank line
+COLLAPSE_SPACES = True
+COLLAPSE_BLANK_LINES = True
+
+BLANK_LINES = re.compile(r'\n(?:[^\S\n]*\n){2,}')
+LEADING_BLANK_LINES = re.compile(r'(?:[^\S\n]*\n){2,}')
+
+class CleanupRules:
+    """
+    Cleanup rules compiled into one pass per kind of rule
+
+    Each pass is a single regular expression that Python's regex engine can
+    scan for quickly (a literal prefix, or a cheap check that skips the pass):
+    all literals in one alternation, emoji only in non-ASCII text, runs of
+    spaces, runs of blank lines. One expression for all rules is slower,
+    because the engine then tries every alternative at every position. A pass
+    that matches nothing returns the text without copying it.
+
+    No pass but the blank-line one crosses a line end, which lets
+    clean_stream clean large files a block of whole lines at a time with the
+    same result as clean.
+
+    Args:
+        replacements (dict): Literal text -> replacement
+        emoji_ranges (list): (first, last) code points to remove
+        collapse_spaces (bool): Collapse runs of spaces that follow text
+        collapse_blank_lines (bool): Collapse runs of blank lines into one
+    """
+
+    def __init__(self, replacements=REPLACEMENTS, emoji_ranges=EMOJI_RANGES,
+                 collapse_spaces=COLLAPSE_SPACES, collapse_blank_lines=COLLAPSE_BLANK_LINES):
+        self.replacements = dict(replacements)
+        self.collapse_blank_lines = collapse_blank_lines
+        # (pattern, replacement, check): the pass runs on texts for which check is true
+        self.passes = []
+        if self.replacements:
+            # Longest first, so a literal wins over any literal it starts with
+            literals = sorted(self.replacements, key=len, reverse=True)
+            pattern = re.compile('|'.join(re.escape(literal) for literal in literals))
+            # A substring test per literal is much faster than the scan, while there are few
+            check = (lambda text: any(literal in text for literal in literals)) if len(literals) <= 16 else None
+            self.passes.append((pattern, lambda match: self.replacements[match.group()], check))
+        if emoji_ranges:
+            # Runs of characters between the lowest and highest emoji code point are
+            # found with a single range test; the table then deletes the emoji among them
+            self.emoji_table = {code: None for first, last in emoji_ranges for code in range(first, last + 1)}
+            low = min(first for first, last in emoji_ranges)
+            high = max(last for first, last in emoji_ranges)
+            candidate = f'[\\U{low:08x}-\\U{high:08x}]'
+            pattern = re.compile(f'{candidate}+(?: +{candidate}+)* *')
+            self.passes.append((pattern, self._strip_emoji, lambda text: not text.isascii()))
+        if collapse_spaces:
+            # Two spaces, then a look back past them for text, so indentation is skipped
+            self.passes.append((re.compile(r'  (?<=\S  ) *'), ' ', lambda text: '  ' in text))
+
+    def _strip_emoji(self, match):
+        """Delete the emoji of a candidate run, with the spaces after them unless they separate text"""
+        run = match.group()
+        stripped = run.translate(self.emoji_table)
+        if stripped == run:
+            return run
+        if stripped.strip():
+            return stripped
+        start = match.start()
+        follows_text = start > 0 and not match.string[start - 1].isspace()
+        return ' ' if follows_text and run.endswith(' ') else ''
+
+    def clean_lines(self, text):
+        """Apply every pass but the blank-line one; text may be any run of whole lines"""
+        for pattern, replacement, check in self.passes:
+            if check is None or check(text):
+                text = pattern.sub(replacement, text)
+        return text
+
+    def collapse(self, text):
+        """Collapse runs of blank lines in text, which starts at the start of a line"""
+        if not self.collapse_blank_lines or '\n' not in text:
+            return text
+        text = BLANK_LINES.sub('\n\n', text)
+        match = LEADING_BLANK_LINES.match(text)
+        if match:
+            text = '\n' + text[match.end():]
+        return text
+
+    def clean(self, content):
+        """Apply every rule to content"""
+        return self.collapse(self.clean_lines(content))
+
+    def clean_stream(self, source, target=None, block_size=STREAM_BLOCK):
+        """
+        Clean source a block of whole lines at a time, writing to target
+
+        Blank lines at the end of a block are held back until the next one,
+        since the run they belong to may continue there.
+
+        Args:
+            source: Text file opened with newline=''
+            target: Text file to write to, or None to only check for changes
+            block_size (int): Approximate number of characters read at a time
+
+        Returns:
+            bool: True when the cleaned text differs from source
+        """
+        changed = False
+        held = ''
+        while True:
+            lines = source.readlines(block_size)
+            if not lines:
+                break
+            block = ''.join(lines)
+            cleaned = self.clean_lines(block)
+            changed = changed or cleaned != block
+            text = held + cleaned
+            # Split after the line holding the last non-blank character
+            end = len(text.rstrip())
+            split = text.find('\n', end) + 1 if end else 0
+            if not split:
+                split = len(text) if end else 0
+            head, held = text[:split], text[split:]
+            collapsed = self.collapse(head)
+            changed = changed or len(collapsed) != len(head)
+            if target is not None:
+                target.write(collapsed)
+        collapsed = self.collapse(held)
+        changed = changed or len(collapsed) != len(held)
+        if target is not None:
+            target.write(collapsed)
+        return changed
+
+DEFAULT_RULES = CleanupRules()
+
+def clean_file_content(content, rules=DEFAULT_RULES):
+    """Remove emojis, hard-coded paths and extra whitespace from content"""
+    return rules.clean(content)
+
+def is_excluded(name, relative_path, excludes):
+    """True when a directory or file name, or its path below the root, matches an exclude pattern"""
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in excludes)
+
+def iter_files(root, extensions=EXTENSIONS, excludes=EXCLUDES):
+    """
+    Walk root once with os.scandir, yielding the files to clean
+
+    Excluded directories are not descended into and symbolic links are not
+    followed, so every file is visited exactly once.
+
+    Args:
+        root (str): Directory to walk
+        extensions (tuple): File name suffixes to clean
+        excludes (list): Glob patterns matched against names and relative paths
+
+    Yields:
+        str: Path of each file to clean
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            print(f" Error: {directory}: {e}", file=sys.stderr)
+            continue
+        subdirectories = []
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            relative_path = os.path.relpath(entry.path, root)
+            if is_excluded(entry.name, relative_path, excludes):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith(extensions):
+                yield entry.path
+        pending.extend(reversed(subdirectories))
+
+def write_atomically(path, text):
+    """Replace path through a temporary file in the same directory, keeping its permissions"""
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            f.write(text)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def stream_clean(path, rules=DEFAULT_RULES, dry_run=False):
+    """
+    Clean a large file line by line into a temporary file, replacing path only when it changed
+
+    Returns:
+        bool: True when the file changed (or would change, in a dry run)
+    """
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as source:
+        if dry_run:
+            return rules.clean_stream(source)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as target:
+                changed = rules.clean_stream(source, target)
+            if changed:
+                shutil.copymode(path, tmp_path)
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return changed
+
+def clean_path(path, dry_run=False):
+    """
+    Clean one file, writing it only when its content changes
+
+    Bytes that are not valid UTF-8 are carried through unchanged. Files of
+    STREAM_THRESHOLD bytes or more are cleaned line by line.
+
+    Returns:
+        tuple: (path, outcome ('cleaned', 'unchanged' or 'error'), error message or None)
+    """
+    try:
+        if os.path.getsize(path) >= STREAM_THRESHOLD:
+            return path, 'cleaned' if stream_clean(path, dry_run=dry_run) else 'unchanged', None
+        with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            content = f.read()
+        cleaned = clean_file_content(content)
+        if cleaned == content:
+            return path, 'unchanged', None
+        if not dry_run:
+            write_atomically(path, cleaned)
+        return path, 'cleaned', None
+    except Exception as e:
+        return path, 'error', str(e)
+
+def clean_tree(root, excludes=EXCLUDES, workers=None, dry_run=False):
+    """
+    Clean every matching file below root in a pool of worker processes
+
+    Returns:
+        dict: Number of files per outcome
+    """
+    paths = list(iter_files(root, EXTENSIONS, excludes))
+    stats = {'cleaned': 0, 'unchanged': 0, 'error': 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, outcome, error in pool.map(clean_path, paths, [dry_run] * len(paths), chunksize=CHUNK_SIZE):
+            stats[outcome] += 1
+            if outcome == 'cleaned':
+                print(f" {'Would clean' if dry_run else 'Cleaned'}: {path}")
+            elif outcome == 'error':
+                print(f" Error: {path}: {error}")
+    return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Clean emojis, hard-coded paths and extra whitespace"
+                                                 f" from {', '.join(EXTENSIONS)} files")
+    parser.add_argument("root", nargs="?", default=".", help="directory to clean (default: current directory)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="also skip directories and files matching this glob pattern (repeatable)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--dry-run", action="store_true", help="report the files that would change without writing")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    stats = clean_tree(args.root, EXCLUDES + args.exclude, args.workers, args.dry_run)
+    print(f"Cleanup complete! {stats['cleaned']} cleaned, {stats['unchanged']} unchanged, {stats['error']} errors")
@@ -23,244 +23,1292 @@ USER_EMAIL = os.getenv('USER_EMAIL', f"{USER}@{os.getenv('COMPANY_DOMAIN', 'exam
 COMPANY_NAME = os.getenv('COMPANY_NAME', 'Your Company')
 COMPANY_DOMAIN = os.getenv('COMPANY_DOMAIN', 'example.com')
 
+import numpy as np
 import pandas as pd
 import requests
 from urllib.parse import urlparse
 import os
 
 # === CONFIGURATION ===
+import argparse
+import cProfile
 import glob
+import sys
+import hashlib
+import json
+import pickle
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 
 
 def find_excel_file():
- """Find the first Excel file in the current directory or data subdirectory"""
- # Check current directory first
- for ext in ['*.xlsx', '*.xls']:
- files = glob.glob(ext)
- if files:
- return files[0]
- 
- # Check data subdirectory
- data_dir = Path('data')
- if data_dir.exists():
- for ext in ['*.xlsx', '*.xls']:
- files = list(data_dir.glob(ext))
- if files:
- return str(files[0])
- 
- return None
+    """Find the first Excel file in the current directory or data subdirectory"""
+    # Check current directory first
+    for ext in ['*.xlsx', '*.xls']:
+        files = glob.glob(ext)
+        if files:
+            return files[0]
+
+    # Check data subdirectory
+    data_dir = Path('data')
+    if data_dir.exists():
+        for ext in ['*.xlsx', '*.xls']:
+            files = list(data_dir.glob(ext))
+            if files:
+                return str(files[0])
+
+    return None
 
 def find_excel_file():
- """Find the first Excel file in the current directory or data subdirectory"""
- # Check current directory first
- for ext in ['*.xlsx', '*.xls']:
- files = glob.glob(ext)
- if files:
- return files[0]
- 
- # Check data subdirectory
- data_dir = Path('data')
- if data_dir.exists():
- for ext in ['*.xlsx', '*.xls']:
- files = list(data_dir.glob(ext))
- if files:
- return str(files[0])
- 
- return None
-
-SOURCE_FILE = find_excel_file() or "business_tools_data.xlsx"
+    """Find the first Excel file in the current directory or data subdirectory"""
+    # Check current directory first
+    for ext in ['*.xlsx', '*.xls']:
+        files = glob.glob(ext)
+        if files:
+            return files[0]
+
+    # Check data subdirectory
+    data_dir = Path('data')
+    if data_dir.exists():
+        for ext in ['*.xlsx', '*.xls']:
+            files = list(data_dir.glob(ext))
+            if files:
+                return str(files[0])
+
+    return None
+
+def find_excel_files(directories=('.', 'data')):
+    """Find every Excel workbook in the given directories"""
+    files = []
+    for directory in directories:
+        for ext in ['*.xlsx', '*.xls']:
+            files.extend(str(path) for path in sorted(Path(directory).glob(ext))
+                         if not path.name.startswith('~$'))
+    # A directory given twice (or as . and ./) lists the same workbooks again
+    unique = {}
+    for path in files:
+        unique.setdefault(os.path.abspath(path), path)
+    return list(unique.values())
+
+DEFAULT_SOURCE_FILE = "business_tools_data.xlsx" # used when no workbook is found
 SHEET_NAME = None # set to specific sheet name if needed
-TEMP_CSV = "tools_temp.csv"
+WORKBOOK_CACHE_DIR = os.getenv('WORKBOOK_CACHE_DIR', '.workbook_cache') # parsed sheets, keyed by workbook content
 CLEANED_CSV = "Cleaned_Tools.csv"
 SUMMARY_CSV = "Tools_Summary.csv"
+CHANGES_CSV = "Tools_Changes.csv"
+MANIFEST_FILE = ".tools_manifest.pkl" # row hashes and results from the last incremental run
+BATCH_OUTPUT_DIR = "batch_output" # per-workbook results and the merged summary in batch mode
+CATEGORICAL_COLUMNS = ["Tool_Type", "URL_Status", "Category"] # few distinct values, stored as categoricals
+
+# URL validation tuning
+URL_TIMEOUT = 6 # seconds per request
+URL_MAX_WORKERS = int(os.getenv('URL_MAX_WORKERS', '32')) # concurrent checks overall
+URL_PER_HOST = int(os.getenv('URL_PER_HOST', '4')) # concurrent checks against one host
+URL_DEADLINE = float(os.getenv('URL_DEADLINE', '300')) # seconds for the whole validation pass
+URL_CACHE_FILE = os.getenv('URL_CACHE_FILE', '.url_status_cache.json')
+URL_CACHE_TTL = float(os.getenv('URL_CACHE_TTL', str(24 * 3600))) # seconds before a cached status is rechecked
+UNCHECKED_STATUS = "Unchecked" # URLs the deadline left no time to check
+KEPT_STATUSES = ("OK", UNCHECKED_STATUS) # rows kept in the cleaned output
+SETTLED_STATUSES = ("OK", "Restricted") # statuses incremental runs reuse; rows with any other are checked again
+
+
+# === INGEST ===
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_from_records(records, columns):
+    # Empty cells come back as None; turn them into NaN as read_excel would
+    df = pd.DataFrame.from_records(records, columns=columns).infer_objects()
+    return df.where(df.notna(), float("nan"))
+
+
+def iter_sheet(path, sheet_name=None, chunk_rows=None):
+    """
+    Read a single sheet, yielding it in pieces of at most chunk_rows rows
+
+    .xlsx files are streamed with openpyxl in read-only mode so that only the
+    selected sheet is parsed and no more than chunk_rows rows are held at a
+    time. Other formats go through pandas.ExcelFile with the sheet resolved up
+    front and are sliced after parsing. Without chunk_rows the whole sheet is
+    yielded as one piece.
+
+    Yields:
+        tuple: (DataFrame, name of the sheet that was read)
+    """
+    if not path.lower().endswith(".xlsx"):
+        with pd.ExcelFile(path) as book:
+            sheet = sheet_name if sheet_name is not None else book.sheet_names[0]
+            if sheet_name is None and len(book.sheet_names) > 1:
+                print(f" Found multiple sheets: {book.sheet_names}")
+                print(f" Using first sheet: '{sheet}'")
+            df = book.parse(sheet)
+        step = chunk_rows or max(len(df), 1)
+        for start in range(0, max(len(df), 1), step):
+            yield df.iloc[start:start + step].copy(), sheet
+        return
+
+    from openpyxl import load_workbook
+
+    book = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = sheet_name if sheet_name is not None else book.sheetnames[0]
+        if sheet_name is None and len(book.sheetnames) > 1:
+            print(f" Found multiple sheets: {book.sheetnames}")
+            print(f" Using first sheet: '{sheet}'")
+        rows = book[sheet].iter_rows(values_only=True)
+        header = next(rows, ())
+        columns = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+        width = len(columns)
+        records = []
+        yielded = False
+        for row in rows:
+            if any(value is not None for value in row):
+                records.append(row[:width])
+            if chunk_rows and len(records) >= chunk_rows:
+                yield frame_from_records(records, columns), sheet
+                records = []
+                yielded = True
+        if records or not yielded:
+            yield frame_from_records(records, columns), sheet
+    finally:
+        book.close()
+
+
+def read_sheet(path, sheet_name=None):
+    """
+    Read a single sheet into a DataFrame
+
+    Returns:
+        tuple: (DataFrame, name of the sheet that was read)
+    """
+    return next(iter_sheet(path, sheet_name))
+
+
+def cache_paths(path, sheet_name, cache_dir):
+    key = hashlib.sha256(f"{os.path.abspath(path)}|{sheet_name}".encode()).hexdigest()[:16]
+    base = os.path.join(cache_dir, key)
+    return f"{base}.json", f"{base}.parquet", f"{base}.pkl"
+
+
+def write_sheet_cache(df, data_path, pickle_path):
+    """Store a parsed sheet as Parquet when pyarrow is available, otherwise as a pickle"""
+    try:
+        import pyarrow  # noqa: F401
+        df.to_parquet(data_path, index=False)
+        return data_path
+    except Exception:
+        with open(pickle_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return pickle_path
+
+
+def ingest_workbook(path, sheet_name=None, cache_dir=WORKBOOK_CACHE_DIR):
+    """
+    Load the selected sheet, reusing a cached parse when the workbook is unchanged
+
+    The cache entry records the workbook's size, mtime and SHA-256. A matching
+    size and mtime is trusted directly; otherwise the file is hashed and a
+    matching hash still counts as unchanged. Timings for each ingest stage are
+    printed.
+
+    Returns:
+        DataFrame: The selected sheet
+    """
+    timings = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        value = func(*args)
+        timings[stage] = timings.get(stage, 0) + time.perf_counter() - start
+        return value
+
+    stat = os.stat(path)
+    df = None
+    meta = {}
+    if cache_dir:
+        meta_path, parquet_path, pickle_path = cache_paths(path, sheet_name, cache_dir)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+
+        unchanged = meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns
+        if not unchanged and meta.get("size") == stat.st_size:
+            meta["new_sha256"] = timed("hash", file_sha256, path)
+            unchanged = meta["new_sha256"] == meta.get("sha256")
+        if unchanged and os.path.exists(meta.get("data", "")):
+            data = meta["data"]
+            try:
+                df = timed("cache read", pd.read_parquet if data.endswith(".parquet") else pd.read_pickle, data)
+            except Exception as e:
+                print(f" Ignoring unreadable workbook cache '{data}': {e}")
+
+    if df is None:
+        df, sheet = timed("parse sheet", read_sheet, path, sheet_name)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            sha256 = meta.get("new_sha256") or timed("hash", file_sha256, path)
+            data = timed("cache write", write_sheet_cache, df, parquet_path, pickle_path)
+            meta = {"source": os.path.abspath(path), "sheet": sheet, "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns, "sha256": sha256, "data": data}
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        print(f" Loaded sheet '{sheet}' from {path}")
+    else:
+        if meta.pop("new_sha256", None):
+            meta["mtime_ns"] = stat.st_mtime_ns
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        print(f" Loaded sheet '{meta['sheet']}' from workbook cache")
+
+    print(" Ingest timings: " + ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timings.items()))
+    return df
 
-# Check if source file exists
-if not os.path.exists(SOURCE_FILE):
- print(f" Error: Source file '{SOURCE_FILE}' not found!")
- print(" Current directory contents:")
- for file in os.listdir('.'):
- if file.endswith(('.xlsx', '.xls', '.csv')):
- print(f" - {file}")
- exit(1)
-
-# === STEP 1: CONVERT XLSX TO CSV ===
-try:
- if SHEET_NAME is None:
- # Read all sheets and use the first one, or combine if multiple
- xls_dict = pd.read_excel(SOURCE_FILE, sheet_name=None)
- if len(xls_dict) == 1:
- # Single sheet, use it
- xls = list(xls_dict.values())[0]
- else:
- # Multiple sheets, list them and use the first one
- sheet_names = list(xls_dict.keys())
- print(f" Found multiple sheets: {sheet_names}")
- print(f" Using first sheet: '{sheet_names[0]}'")
- xls = xls_dict[sheet_names[0]]
- else:
- # Read specific sheet
- xls = pd.read_excel(SOURCE_FILE, sheet_name=SHEET_NAME)
- 
- xls.to_csv(TEMP_CSV, index=False)
- print(" Excel file converted to CSV.")
-except Exception as e:
- print(" Failed to convert Excel file:", e)
- exit(1)
-
-# === STEP 2: LOAD AND CLEAN ===
-df = pd.read_csv(TEMP_CSV)
-
-# Debug: Show original columns
-print(" Original columns found:", list(df.columns))
-
-# Fix column names
-df.columns = [col.strip().title().replace(" ", "_") for col in df.columns]
-
-# Debug: Show cleaned columns
-print(" Cleaned columns:", list(df.columns))
-
-# Check if required columns exist
-required_cols = ['URL', 'Name', 'Synopsis', 'Tool_Type']
-missing_cols = [col for col in required_cols if col not in df.columns]
-
-if missing_cols:
- print(f" Missing required columns: {missing_cols}")
- print(" Available columns:", list(df.columns))
- print(" Please check the Excel file structure or update column names in the script.")
- # Try to map common variations
- column_mapping = {
- 'Url': 'URL', # Handle the lowercase 'url' case
- 'Link': 'URL',
- 'Links': 'URL', 
- 'Web_Link': 'URL',
- 'Tool_Name': 'Name',
- 'Title': 'Name',
- 'Description': 'Synopsis',
- 'Type': 'Tool_Type',
- 'Category': 'Tool_Type'
- }
- 
- for old_name, new_name in column_mapping.items():
- if old_name in df.columns and new_name not in df.columns:
- df.rename(columns={old_name: new_name}, inplace=True)
- print(f" Mapped '{old_name}' → '{new_name}'")
- 
- # Check again after mapping
- missing_cols = [col for col in required_cols if col not in df.columns]
- if missing_cols:
- print(f" Still missing columns after mapping: {missing_cols}")
- exit(1)
-
-# Normalize types and fix known typos
-if 'Tool_Type' in df.columns:
- fix_typos = {
- "colaboration": "Collaboration",
- "auth": "Authentication",
- "authentcation": "Authentication",
- "applcation": "Application",
- "informaton": "Information",
- "Demo Tool": "Demo",
- "Video Editing": "Media Tool"
- }
- df["Tool_Type"] = df["Tool_Type"].replace(fix_typos)
-
-# Strip whitespace from URLs
-if 'URL' in df.columns:
- df["URL"] = df["URL"].astype(str).str.strip()
 
 # Check URL status
-def check_url(url):
- try:
- response = requests.head(url, allow_redirects=True, timeout=6)
- if response.status_code == 200:
- return "OK"
- elif response.status_code == 403:
- return "Restricted"
- else:
- return f"Error {response.status_code}"
- except:
- return "Invalid"
-
-if 'URL' in df.columns:
- print(" Validating URLs (this may take a minute)...")
- df["URL_Status"] = df["URL"].apply(check_url)
- 
- # Filter only valid URLs
- df = df[df["URL_Status"] == "OK"]
- print(f" Found {len(df)} tools with valid URLs")
-else:
- print(" No URL column found, skipping URL validation")
+def status_label(status_code):
+    if status_code == 200:
+        return "OK"
+    elif status_code == 403:
+        return "Restricted"
+    else:
+        return f"Error {status_code}"
+
+
+def probe_url(url, session=None, timeout=URL_TIMEOUT, headers=None):
+    """Check a URL and return its status along with the final redirect target and validators"""
+    try:
+        response = (session or requests).head(url, allow_redirects=True, timeout=timeout, headers=headers)
+    except:
+        return {"status": "Invalid"}
+    return {
+        "status": status_label(response.status_code),
+        "status_code": response.status_code,
+        "final_url": response.url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def check_url(url, session=None, timeout=URL_TIMEOUT):
+    return probe_url(url, session=session, timeout=timeout)["status"]
+
+
+def normalize_url(url):
+    """Normalize a URL for use as a cache key"""
+    try:
+        parts = urlparse(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{scheme}://{host}{path}{query}"
+
+
+class URLStatusCache:
+    """
+    On-disk cache of URL check results keyed by normalized URL
+
+    Each entry holds the status, the final redirect target, the ETag and
+    Last-Modified validators and the time of the last check. Entries younger
+    than the TTL are used as-is; older entries that carry a validator are
+    revalidated with a conditional request. Network failures ("Invalid") are
+    not cached so that they are retried on the next run.
+    """
+
+    def __init__(self, path=URL_CACHE_FILE, ttl=URL_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f" Ignoring unreadable URL cache '{path}': {e}")
+
+    def get(self, url):
+        return self.entries.get(normalize_url(url))
+
+    def is_fresh(self, entry, now=None):
+        return (now or time.time()) - entry.get("checked_at", 0) < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def store(self, url, result):
+        if result["status"] == "Invalid":
+            return
+        entry = {key: result.get(key) for key in ("status", "final_url", "etag", "last_modified")}
+        entry["checked_at"] = time.time()
+        with self.lock:
+            self.entries[normalize_url(url)] = entry
+
+    def touch(self, url):
+        with self.lock:
+            self.entries[normalize_url(url)]["checked_at"] = time.time()
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with self.lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        return (f"URL cache: {self.stats['hits']} hits, {self.stats['revalidated']} revalidated, "
+                f"{self.stats['misses']} misses")
+
+
+def make_session(pool_size=URL_MAX_WORKERS):
+    """Create a requests session whose connection pool can serve every worker"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def validate_urls(urls, max_workers=URL_MAX_WORKERS, per_host=URL_PER_HOST,
+                  deadline=URL_DEADLINE, timeout=URL_TIMEOUT, session=None,
+                  cache=None, force_refresh=False):
+    """
+    Check many URLs concurrently
+
+    Each distinct URL is checked once through a shared pooled session. At most
+    max_workers checks run at a time, and at most per_host of them against the
+    same host. URLs wait in one queue per host and a check is only started
+    for a host with a free slot, so a slow host never holds up workers that
+    could be checking other hosts. URLs not reached before the global deadline
+    are reported as UNCHECKED_STATUS rather than as failures.
+
+    With a cache, URLs whose cached status is younger than the TTL are not
+    requested at all, and stale entries are revalidated with a conditional
+    request. force_refresh ignores cached statuses and checks every URL again.
+    The cache is only updated in memory; saving it is left to the caller, once
+    per pass rather than once per call.
+
+    Args:
+        urls (iterable): URLs to check
+        max_workers (int): Overall concurrency limit
+        per_host (int): Concurrency limit per host
+        deadline (float): Seconds allowed for the whole pass
+        timeout (float): Seconds allowed for a single request
+        session (requests.Session): Session to reuse, created if not given
+        cache (URLStatusCache): Cache of earlier results, or None
+        force_refresh (bool): Recheck every URL regardless of the cache
+
+    Returns:
+        dict: Mapping of URL to status
+    """
+    unique = list(dict.fromkeys(urls))
+    results = {}
+
+    if cache is not None and not force_refresh:
+        now = time.time()
+        pending = []
+        for url in unique:
+            entry = cache.get(url)
+            if entry and cache.is_fresh(entry, now):
+                results[url] = entry["status"]
+                cache.count("hits")
+            else:
+                pending.append(url)
+        unique = pending
+
+    if not unique:
+        return results
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max_workers)
+
+    queues = defaultdict(deque)
+    for url in unique:
+        queues[urlparse(url).netloc.lower()].append(url)
+    active = defaultdict(int)
+    stop_at = time.monotonic() + deadline
+
+    def worker(url):
+        remaining = stop_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        timeout_left = min(timeout, remaining)
+        entry = None if force_refresh or cache is None else cache.get(url)
+        headers = cache.conditional_headers(entry) if cache is not None else None
+        result = probe_url(url, session=session, timeout=timeout_left, headers=headers or None)
+        if result["status"] == "Invalid" and timeout_left < timeout and time.monotonic() >= stop_at:
+            # Cut short by the deadline rather than failed
+            return None
+        if cache is None:
+            return result["status"]
+        if headers and result.get("status_code") == 304:
+            cache.touch(url)
+            cache.count("revalidated")
+            return entry["status"]
+        cache.store(url, result)
+        cache.count("misses")
+        return result["status"]
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    running = {}
+    try:
+        while queues or running:
+            # Start checks round-robin over the hosts that have a free slot
+            started = True
+            while started and queues and len(running) < max_workers and time.monotonic() < stop_at:
+                started = False
+                for host in list(queues):
+                    if len(running) >= max_workers:
+                        break
+                    if active[host] >= per_host:
+                        continue
+                    url = queues[host].popleft()
+                    if not queues[host]:
+                        del queues[host]
+                    active[host] += 1
+                    running[pool.submit(worker, url)] = (host, url)
+                    started = True
+
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0 and not running:
+                break
+            done, _ = wait(running, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+            if not done and remaining <= 0:
+                # Checks already running end within the per-request timeout, capped at the deadline
+                done, _ = wait(running)
+            for future in done:
+                host, url = running.pop(future)
+                active[host] -= 1
+                results[url] = future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if own_session:
+            session.close()
+
+    unchecked = [url for url in unique if results.get(url) is None]
+    for url in unchecked:
+        results[url] = UNCHECKED_STATUS
+    if unchecked:
+        print(f" Deadline of {deadline:g}s reached, {len(unchecked)} URLs were not checked"
+              f" and are kept as '{UNCHECKED_STATUS}'")
+    return results
+
 
 # === STEP 3: ENHANCE NAMES & DESCRIPTIONS ===
 def enhance_name(name):
- name_map = {
- "Draw.io": "Draw.io – Web Diagramming Tool",
- "Doitlive": "Doitlive – Terminal Demo Simulator",
- "Skype": "Skype – Web-Based Video & Voice Communication",
- "Trello": "Trello – Visual Project Management Boards",
- "Lucidchart": "Lucidchart – Intelligent Diagramming Platform",
- "Jupyterlab": "JupyterLab – Interactive Data Science Environment"
- }
- return name_map.get(name, name)
+    name_map = {
+        "Draw.io": "Draw.io – Web Diagramming Tool",
+        "Doitlive": "Doitlive – Terminal Demo Simulator",
+        "Skype": "Skype – Web-Based Video & Voice Communication",
+        "Trello": "Trello – Visual Project Management Boards",
+        "Lucidchart": "Lucidchart – Intelligent Diagramming Platform",
+        "Jupyterlab": "JupyterLab – Interactive Data Science Environment"
+    }
+    return name_map.get(name, name)
+
+# Keyword rules, in priority order: the first rule with a keyword found in the
+# lowercased text wins
+SYNOPSIS_RULES = [
+    (("diagram",), "Tool for creating flowcharts, architecture maps, and process diagrams."),
+    (("learning", "labs"), "Interactive learning tools and environments for ${COMPANY_NAME} technologies."),
+    (("authentic", "token"), "Authentication and identity tools for secure access control."),
+    (("stream", "video"), "Utilities for recording, streaming, and multimedia editing."),
+    (("terminal",), "CLI tools for sysadmin workflows and shell automation."),
+    (("git",), "Repositories or tools for managing source code and collaboration."),
+]
+
+CATEGORY_RULES = [
+    (("authentication", "token"), "Security"),
+    (("learning", "labs", "training"), "Education"),
+    (("diagram",), "Diagramming"),
+    (("stream", "video", "recording"), "Media Tools"),
+    (("git", "repository"), "Code Repositories"),
+    (("meeting", "conference"), "Meetings"),
+    (("automation", "ansible"), "Automation"),
+    (("terminal",), "CLI Utilities"),
+]
+DEFAULT_CATEGORY = "General Utilities"
+MISSING_DESCRIPTION = "Tool description not available"
+
+
+def first_matching_rule(text, rules):
+    """Return the value of the first rule with a keyword in text, or None"""
+    text = str(text).lower()
+    for keywords, value in rules:
+        if any(keyword in text for keyword in keywords):
+            return value
+    return None
+
+
+def match_rules(texts, rules, default):
+    """
+    Evaluate a rule table over a whole column at once
+
+    Each rule becomes one alternation regex run over the lowercased
+    column, and np.select picks the first matching rule per row,
+    giving the same first-match-wins result as first_matching_rule.
+
+    Args:
+        texts (Series): Text to match
+        rules (list): (keywords, value) pairs in priority order
+        default: Scalar or Series used where no rule matches
+
+    Returns:
+        Series: Matched values aligned with texts
+    """
+    lowered = texts.astype(object).astype(str).str.lower()
+    conditions = [
+        lowered.str.contains("|".join(re.escape(keyword) for keyword in keywords), regex=True).to_numpy(dtype=bool)
+        for keywords, _ in rules
+    ]
+    choices = [np.full(len(lowered), value, dtype=object) for _, value in rules]
+    fallback = default.to_numpy(dtype=object) if isinstance(default, pd.Series) else default
+    return pd.Series(np.select(conditions, choices, default=fallback), index=texts.index, dtype=object)
+
+
+def synopsis_column(columns):
+    return 'Synopsis' if 'Synopsis' in columns else 'Description' if 'Description' in columns else None
+
 
 def enhance_description(row):
- synopsis_col = 'Synopsis' if 'Synopsis' in df.columns else 'Description' if 'Description' in df.columns else None
- if synopsis_col is None:
- return "Tool description not available"
- 
- synopsis = str(row[synopsis_col]).lower()
- if "diagram" in synopsis:
- return "Tool for creating flowcharts, architecture maps, and process diagrams."
- elif "learning" in synopsis or "labs" in synopsis:
- return "Interactive learning tools and environments for ${COMPANY_NAME} technologies."
- elif "authentic" in synopsis or "token" in synopsis:
- return "Authentication and identity tools for secure access control."
- elif "stream" in synopsis or "video" in synopsis:
- return "Utilities for recording, streaming, and multimedia editing."
- elif "terminal" in synopsis:
- return "CLI tools for sysadmin workflows and shell automation."
- elif "git" in synopsis:
- return "Repositories or tools for managing source code and collaboration."
- return row[synopsis_col] if synopsis_col in row else "Tool description not available"
-
-if 'Name' in df.columns:
- df["Name"] = df["Name"].apply(enhance_name)
-else:
- print(" No Name column found")
-
-df["Enhanced_Synopsis"] = df.apply(enhance_description, axis=1)
+    synopsis_col = synopsis_column(row.index)
+    if synopsis_col is None:
+        return MISSING_DESCRIPTION
+    return first_matching_rule(row[synopsis_col], SYNOPSIS_RULES) or row[synopsis_col]
+
+
+def enhance_descriptions(df):
+    """Vectorized enhance_description over every row of df"""
+    synopsis_col = synopsis_column(df.columns)
+    if synopsis_col is None:
+        return pd.Series(MISSING_DESCRIPTION, index=df.index, dtype=object)
+    return match_rules(df[synopsis_col], SYNOPSIS_RULES, df[synopsis_col])
+
 
 # === STEP 4: CATEGORIZE ===
 def categorize(row):
- desc = str(row["Enhanced_Synopsis"]).lower()
- if "authentication" in desc or "token" in desc:
- return "Security"
- elif "learning" in desc or "labs" in desc or "training" in desc:
- return "Education"
- elif "diagram" in desc:
- return "Diagramming"
- elif "stream" in desc or "video" in desc or "recording" in desc:
- return "Media Tools"
- elif "git" in desc or "repository" in desc:
- return "Code Repositories"
- elif "meeting" in desc or "conference" in desc:
- return "Meetings"
- elif "automation" in desc or "ansible" in desc:
- return "Automation"
- elif "terminal" in desc:
- return "CLI Utilities"
- return "General Utilities"
-
-df["Category"] = df.apply(categorize, axis=1)
+    return first_matching_rule(row["Enhanced_Synopsis"], CATEGORY_RULES) or DEFAULT_CATEGORY
+
+
+def categorize_all(synopses):
+    """Vectorized categorize over a column of enhanced synopses"""
+    return match_rules(synopses, CATEGORY_RULES, DEFAULT_CATEGORY)
+
+
+class MissingColumnsError(ValueError):
+    """Raised when the sheet lacks required columns even after mapping common variations"""
+
+
+def normalize_columns(df, verbose=True):
+    """Normalize column names and map common variations onto the required ones"""
+    log = print if verbose else (lambda *args: None)
+
+    # Debug: Show original columns
+    log(" Original columns found:", list(df.columns))
+
+    # Fix column names
+    df.columns = [col.strip().title().replace(" ", "_") for col in df.columns]
+
+    # Debug: Show cleaned columns
+    log(" Cleaned columns:", list(df.columns))
+
+    # Check if required columns exist
+    required_cols = ['URL', 'Name', 'Synopsis', 'Tool_Type']
+    missing_cols = [col for col in required_cols if col not in df.columns]
+
+    if missing_cols:
+        log(f" Missing required columns: {missing_cols}")
+        log(" Available columns:", list(df.columns))
+        log(" Please check the Excel file structure or update column names in the script.")
+        # Try to map common variations
+        column_mapping = {
+            'Url': 'URL', # Handle the lowercase 'url' case
+            'Link': 'URL',
+            'Links': 'URL',
+            'Web_Link': 'URL',
+            'Tool_Name': 'Name',
+            'Title': 'Name',
+            'Description': 'Synopsis',
+            'Type': 'Tool_Type',
+            'Category': 'Tool_Type'
+        }
+
+        for old_name, new_name in column_mapping.items():
+            if old_name in df.columns and new_name not in df.columns:
+                df.rename(columns={old_name: new_name}, inplace=True)
+                log(f" Mapped '{old_name}' → '{new_name}'")
+
+        # Check again after mapping
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            raise MissingColumnsError(f"Still missing columns after mapping: {missing_cols}")
+
+    return df
+
+
+def fix_typos(df):
+    """Fix known Tool_Type typos and strip whitespace from URLs"""
+    # Normalize types and fix known typos
+    if 'Tool_Type' in df.columns:
+        fix_typos = {
+            "colaboration": "Collaboration",
+            "auth": "Authentication",
+            "authentcation": "Authentication",
+            "applcation": "Application",
+            "informaton": "Information",
+            "Demo Tool": "Demo",
+            "Video Editing": "Media Tool"
+        }
+        df["Tool_Type"] = df["Tool_Type"].replace(fix_typos)
+
+    # Strip whitespace from URLs
+    if 'URL' in df.columns:
+        df["URL"] = df["URL"].astype(str).str.strip()
+
+    return df
+
+
+def clean_columns(df, verbose=True):
+    """Normalize column names, map common variations and fix known typos"""
+    return fix_typos(normalize_columns(df, verbose))
+
+
+def validate_url_column(df, args, cache=None):
+    """
+    Fill URL_Status for every row of df. Without a cache given, the URL cache
+    is loaded and saved again afterwards, even when the checks are interrupted
+    """
+    print(" Validating URLs (this may take a minute)...")
+    start = time.monotonic()
+    own_cache = cache is None and not args.no_url_cache
+    if own_cache:
+        cache = URLStatusCache(args.url_cache, args.cache_ttl)
+    try:
+        statuses = validate_urls(df["URL"], cache=cache, force_refresh=args.refresh_urls)
+    finally:
+        if own_cache:
+            cache.save()
+    df["URL_Status"] = df["URL"].map(statuses)
+    print(f" Checked {len(statuses)} unique URLs in {time.monotonic() - start:.1f}s")
+    if cache is not None:
+        print(f" {cache.summary()}")
+    return df
+
+
+def enhance_tools(df):
+    """Add enhanced names and Enhanced_Synopsis to df"""
+    if 'Name' in df.columns:
+        df["Name"] = df["Name"].apply(enhance_name)
+    else:
+        print(" No Name column found")
+
+    df["Enhanced_Synopsis"] = enhance_descriptions(df)
+    return df
+
+
+def categorize_tools(df):
+    """Add Category to df from its Enhanced_Synopsis"""
+    df["Category"] = categorize_all(df["Enhanced_Synopsis"])
+    return df
+
+
+def enhance_and_categorize(df):
+    """Add enhanced names, Enhanced_Synopsis and Category to df"""
+    return categorize_tools(enhance_tools(df))
+
+
+def category_summary(counts):
+    """Build the summary table from a Category -> count mapping, largest first"""
+    rows = sorted(((category, count) for category, count in counts.items() if count > 0),
+                  key=lambda item: -item[1])
+    return pd.DataFrame(rows, columns=["Category", "Tool_Count"])
+
+
+# === INCREMENTAL MODE ===
+def row_hashes(df):
+    """Content hash of every row, independent of the row's position"""
+    return pd.util.hash_pandas_object(df, index=False).astype("uint64")
+
+
+def row_keys(df):
+    """Identity of each row for the change report: its source name and URL"""
+    name = df["Name"].astype(object).astype(str) if "Name" in df.columns else pd.Series("", index=df.index)
+    url = df["URL"].astype(object).astype(str) if "URL" in df.columns else pd.Series("", index=df.index)
+    return name + " | " + url
+
+
+def load_manifest(path, columns):
+    """Load the previous run's manifest, ignoring it if the sheet layout changed"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            manifest = pickle.load(f)
+    except Exception as e:
+        print(f" Ignoring unreadable manifest '{path}': {e}")
+        return None
+    if manifest.get("columns") != list(columns):
+        print(" Sheet columns changed since the last run, reprocessing every row")
+        return None
+    return manifest
+
+
+def save_manifest(path, columns, rows, summary):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"columns": list(columns), "rows": rows, "summary": summary}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def status_column(df):
+    return df["URL_Status"] if "URL_Status" in df.columns else pd.Series("", index=df.index)
+
+
+def ok_rows(df):
+    return df[df["URL_Status"].isin(KEPT_STATUSES)] if "URL_Status" in df.columns else df
+
+
+def row_counts(df):
+    """Number of rows per (row hash, URL status) pair, with None as the status when there is no URL_Status"""
+    statuses = df["URL_Status"].astype(object) if "URL_Status" in df.columns else [None] * len(df)
+    return pd.Series(list(zip(df["_row_hash"], statuses)), dtype=object).value_counts()
+
+
+def change_report(old_rows, new_rows):
+    """List rows added, removed and with a changed URL status between two runs"""
+    old_status = dict(zip(old_rows["_row_key"], status_column(old_rows)))
+    new_status = dict(zip(new_rows["_row_key"], status_column(new_rows)))
+    report = []
+    for key, status in new_status.items():
+        if key not in old_status:
+            report.append(("added", key, "", status))
+        elif old_status[key] != status:
+            report.append(("status_changed", key, old_status[key], status))
+    for key, status in old_status.items():
+        if key not in new_status:
+            report.append(("removed", key, status, ""))
+    return pd.DataFrame(report, columns=["Change", "Tool", "Old_Status", "New_Status"])
+
+
+def run_incremental(df, args):
+    """
+    Process only rows that are new or changed since the last incremental run
+
+    The manifest keeps every processed row from the previous run, keyed by a
+    content hash of its cleaned source columns. Rows whose hash is already in
+    the manifest reuse the stored URL status, synopsis and category, as long
+    as that status is one of SETTLED_STATUSES; only the rest go through
+    validation and enhancement, so URLs that failed or were left unchecked
+    are tried again. The category summary is updated from the rows whose
+    hash or URL status appeared and disappeared, and a change report is
+    written alongside the usual outputs.
+
+    Returns:
+        bool: False when nothing changed and the outputs were left untouched
+    """
+    source_columns = list(df.columns)
+    df["_row_hash"] = row_hashes(df[source_columns])
+    df["_row_key"] = row_keys(df)
+
+    manifest = load_manifest(args.manifest, source_columns)
+    if manifest is None:
+        old_rows = df.iloc[0:0].copy()
+        old_summary = {}
+    else:
+        old_rows = manifest["rows"]
+        old_summary = dict(manifest["summary"])
+
+    known = old_rows.drop_duplicates("_row_hash").set_index("_row_hash")
+    if "URL_Status" in known.columns:
+        settled = known["URL_Status"].astype(object).isin(SETTLED_STATUSES)
+        recheck = df["_row_hash"].isin(known.index[~settled])
+        known = known[settled]
+    else:
+        recheck = pd.Series(False, index=df.index)
+    is_known = df["_row_hash"].isin(known.index)
+    changed = df[~is_known].copy()
+    rechecked = int(recheck.sum())
+    print(f" Incremental mode: {int(is_known.sum())} rows unchanged, {len(changed)} new or changed"
+          + (f", {rechecked} of them rechecked after a failed or skipped URL check" if rechecked else ""))
+
+    if len(changed):
+        if 'URL' in changed.columns:
+            changed = validate_url_column(changed, args)
+        changed = enhance_and_categorize(changed)
+
+    reused = known.loc[df.loc[is_known, "_row_hash"]].reset_index()
+    reused.index = df.index[is_known]
+    rows = pd.concat([reused, changed]).sort_index()[changed.columns if len(changed) else reused.columns]
+
+    # Count rows by content and URL status, so a rechecked URL whose status changed is a change too
+    delta = row_counts(rows).sub(row_counts(old_rows), fill_value=0)
+    delta = delta[delta != 0]
+    if not len(delta) and os.path.exists(CLEANED_CSV) and os.path.exists(SUMMARY_CSV):
+        print(" No changes since the last run, outputs left as they are")
+        return False
+
+    # Apply the delta to the previous category counts
+    categories = pd.concat([old_rows, rows]).drop_duplicates("_row_hash").set_index("_row_hash")["Category"]
+    summary = defaultdict(int, old_summary)
+    for (row_hash, status), count in delta.items():
+        if status is None or status in KEPT_STATUSES:
+            summary[categories[row_hash]] += int(count)
+
+    export_results(ok_rows(rows).drop(columns=["_row_hash", "_row_key"]), category_summary(summary))
+    change_report(old_rows, rows).to_csv(CHANGES_CSV, index=False)
+    save_manifest(args.manifest, source_columns, rows, dict(summary))
+    print(f"- Change report saved to: {CHANGES_CSV}")
+    return True
+
+
+# === CHUNKED MODE ===
+def to_categoricals(df):
+    """Store the low-cardinality columns as categoricals"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be measured"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_chunked(path, args):
+    """
+    Clean, validate, enhance and categorize the sheet a chunk at a time
+
+    At most args.chunk_rows rows are held in memory at once. Each processed
+    chunk is filtered to valid URLs and appended to the cleaned CSV, and the
+    category summary is kept as a running count. Outputs are written under a
+    temporary name and moved into place once every chunk is done. The URL
+    cache is shared by the chunks and saved once, when the pass ends or is
+    interrupted.
+    """
+    cache = None if args.no_url_cache else URLStatusCache(args.url_cache, args.cache_ttl)
+    counts = defaultdict(int)
+    tmp_path = f"{CLEANED_CSV}.tmp"
+    rows_in = rows_out = 0
+
+    try:
+        for number, (chunk, sheet) in enumerate(iter_sheet(path, args.sheet, args.chunk_rows)):
+            if number == 0:
+                print(f" Streaming sheet '{sheet}' from {path} in chunks of {args.chunk_rows} rows")
+            rows_in += len(chunk)
+            chunk = clean_columns(chunk, verbose=number == 0)
+            if 'URL' in chunk.columns:
+                chunk = validate_url_column(chunk, args, cache)
+                chunk = to_categoricals(chunk)
+                chunk = chunk[chunk["URL_Status"].isin(KEPT_STATUSES)]
+            chunk = to_categoricals(enhance_and_categorize(chunk))
+
+            chunk.to_csv(tmp_path, index=False, mode="w" if number == 0 else "a", header=number == 0)
+            for category, count in chunk["Category"].value_counts().items():
+                counts[category] += int(count)
+            rows_out += len(chunk)
+            print(f" Chunk {number + 1}: {rows_in} rows read, {rows_out} kept")
+    finally:
+        if cache is not None:
+            cache.save()
+
+    os.replace(tmp_path, CLEANED_CSV)
+    category_summary(counts).to_csv(SUMMARY_CSV, index=False)
+    if cache is not None:
+        print(f" {cache.summary()}")
+
+
+# === BATCH MODE ===
+def load_for_batch(path, args):
+    """Process-pool task: ingest and clean one workbook"""
+    try:
+        cache_dir = None if args.no_workbook_cache else WORKBOOK_CACHE_DIR
+        return clean_columns(ingest_workbook(path, args.sheet, cache_dir), verbose=False), None
+    except Exception as e:
+        return None, str(e)
+
+
+def batch_names(paths):
+    """
+    Unique output name for each workbook, from its path relative to the directory the workbooks share
+
+    ./tools.xlsx and data/tools.xlsx become "tools" and "data_tools". Workbooks
+    that differ only in their extension keep it: book.xlsx and book.xls become
+    "book_xlsx" and "book_xls". A workbook whose name is still taken after that
+    is skipped with a warning and left out of the result.
+    """
+    absolute = {path: os.path.abspath(path) for path in paths}
+    common = os.path.commonpath([os.path.dirname(path) for path in absolute.values()])
+    stems = {path: os.path.splitext(os.path.relpath(full, common)) for path, full in absolute.items()}
+    shared = Counter(stem for stem, _ in stems.values())
+    names, owners = {}, {}
+    for path, (stem, extension) in stems.items():
+        name = stem if shared[stem] == 1 else stem + extension.replace(".", "_")
+        name = name.replace(os.sep, "_")
+        if name in owners:
+            print(f" Skipping {path}: {owners[name]} is already saved as '{name}'")
+            continue
+        owners[name] = path
+        names[path] = name
+    return names
+
+
+def finish_for_batch(path, name, df, statuses, output_dir):
+    """Process-pool task: apply URL statuses, enhance, categorize and export one workbook"""
+    if 'URL' in df.columns:
+        df["URL_Status"] = df["URL"].map(statuses)
+        df = to_categoricals(df)
+        df = df[df["URL_Status"].isin(KEPT_STATUSES)]
+    df = to_categoricals(enhance_and_categorize(df))
+
+    counts = {category: int(count) for category, count in df["Category"].value_counts().items() if count}
+    df.to_csv(os.path.join(output_dir, f"{name}_{CLEANED_CSV}"), index=False)
+    category_summary(counts).to_csv(os.path.join(output_dir, f"{name}_{SUMMARY_CSV}"), index=False)
+    return counts
+
+
+def run_batch(paths, args):
+    """
+    Process several workbooks in parallel
+
+    Workbooks are loaded and cleaned across a process pool. Their URLs are
+    then merged into one deduplicated list and validated once, so a URL
+    listed in several workbooks is only checked a single time. A second
+    process-pool pass enhances, categorizes and exports each workbook, and the
+    per-workbook category counts are merged into one summary, with one column
+    per workbook named by batch_names.
+    """
+    names = batch_names(paths)
+    paths = [path for path in paths if path in names]
+    os.makedirs(args.batch_output, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+    print(f" Batch mode: {len(paths)} workbooks, {workers} worker processes")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = {}
+        for path, (df, error) in zip(paths, pool.map(load_for_batch, paths, [args] * len(paths))):
+            if error:
+                print(f" Skipping {path}: {error}")
+            else:
+                frames[path] = df
+                print(f" Loaded {path}: {len(df)} rows")
+
+        urls = [url for df in frames.values() if 'URL' in df.columns for url in df["URL"]]
+        statuses = {}
+        if urls:
+            print(f" Validating {len(set(urls))} unique URLs from {len(urls)} rows...")
+            cache = None if args.no_url_cache else URLStatusCache(args.url_cache, args.cache_ttl)
+            try:
+                statuses = validate_urls(urls, cache=cache, force_refresh=args.refresh_urls)
+            finally:
+                if cache is not None:
+                    cache.save()
+            if cache is not None:
+                print(f" {cache.summary()}")
+
+        futures = {
+            path: pool.submit(finish_for_batch, path, names[path], df,
+                              {url: statuses[url] for url in df["URL"]} if 'URL' in df.columns else {},
+                              args.batch_output)
+            for path, df in frames.items()
+        }
+        per_workbook = {path: future.result() for path, future in futures.items()}
+
+    merged = category_summary({
+        category: sum(counts.get(category, 0) for counts in per_workbook.values())
+        for category in {category for counts in per_workbook.values() for category in counts}
+    })
+    for path, counts in per_workbook.items():
+        merged[names[path]] = merged["Category"].map(counts).fillna(0).astype(int)
+    merged_path = os.path.join(args.batch_output, f"Merged_{SUMMARY_CSV}")
+    merged.to_csv(merged_path, index=False)
+    print(f" Batch complete!\n- Per-workbook results saved to: {args.batch_output}/\n- Merged summary saved to: {merged_path}")
+
 
 # === STEP 5: EXPORT RESULTS ===
-df.to_csv(CLEANED_CSV, index=False)
-summary = df["Category"].value_counts().reset_index()
-summary.columns = ["Category", "Tool_Count"]
-summary.to_csv(SUMMARY_CSV, index=False)
+def export_results(df, summary):
+    df.to_csv(CLEANED_CSV, index=False)
+    summary.to_csv(SUMMARY_CSV, index=False)
+
+
+# === PIPELINE STAGES ===
+# Every stage takes the DataFrame produced by the previous one plus the parsed
+# options and returns the DataFrame for the next; ingest ignores its input.
+def stage_ingest(df, args):
+    if not os.path.exists(args.source):
+        raise FileNotFoundError(f"Source file '{args.source}' not found!")
+    return ingest_workbook(args.source, args.sheet, None if args.no_workbook_cache else WORKBOOK_CACHE_DIR)
+
+
+def stage_normalize(df, args):
+    return normalize_columns(df)
+
+
+def stage_fix_typos(df, args):
+    return fix_typos(df)
+
+
+def stage_validate(df, args):
+    if 'URL' not in df.columns:
+        print(" No URL column found, skipping URL validation")
+        return df
+    df = to_categoricals(validate_url_column(df, args))
+
+    # Filter only valid URLs, keeping the ones the deadline left unchecked
+    df = df[df["URL_Status"].isin(KEPT_STATUSES)]
+    unchecked = int((df["URL_Status"] == UNCHECKED_STATUS).sum())
+    print(f" Found {len(df) - unchecked} tools with valid URLs"
+          + (f", kept {unchecked} whose URLs were not checked" if unchecked else ""))
+    return df
+
+
+def stage_enhance(df, args):
+    return enhance_tools(df)
+
+
+def stage_categorize(df, args):
+    return to_categoricals(categorize_tools(df))
+
+
+def stage_export(df, args):
+    summary = df["Category"].value_counts().reset_index()
+    summary.columns = ["Category", "Tool_Count"]
+    export_results(df, summary)
+    return df
+
+
+STAGES = [
+    ("ingest", stage_ingest),
+    ("normalize", stage_normalize),
+    ("fix-typos", stage_fix_typos),
+    ("validate", stage_validate),
+    ("enhance", stage_enhance),
+    ("categorize", stage_categorize),
+    ("export", stage_export),
+]
+STAGE_NAMES = [name for name, _ in STAGES]
+
+
+def current_rss_mb():
+    """Current resident set size in MB, falling back to the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+class StageProfiler:
+    """Record wall time, rows in/out and memory delta for each pipeline stage"""
+
+    def __init__(self):
+        self.records = []
+
+    def run(self, name, func, df, args):
+        rows_in = len(df) if df is not None else 0
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        df = func(df, args)
+        elapsed = time.perf_counter() - start
+        rss_after = current_rss_mb()
+        memory = rss_after - rss_before if rss_before is not None and rss_after is not None else float("nan")
+        self.records.append((name, elapsed, rows_in, len(df), memory))
+        return df
+
+    def report(self):
+        print("\n Stage profile:")
+        print(f" {'stage':<12}{'wall (s)':>10}{'rows in':>10}{'rows out':>10}{'mem (MB)':>10}")
+        for name, elapsed, rows_in, rows_out, memory in self.records:
+            print(f" {name:<12}{elapsed:>10.3f}{rows_in:>10}{rows_out:>10}{memory:>+10.1f}")
+        print(f" {'total':<12}{sum(record[1] for record in self.records):>10.3f}")
+
+
+def run_pipeline(args, stages=None, df=None, profiler=None):
+    """
+    Run the named stages, in pipeline order, and return the resulting DataFrame
+
+    Args:
+        args (Namespace): Options as returned by parse_args()
+        stages (iterable): Stage names to run, all of STAGE_NAMES by default
+        df (DataFrame): Input for the first stage when it is not ingest
+        profiler (StageProfiler): Records per-stage timings when given
+
+    Returns:
+        DataFrame: Output of the last stage
+    """
+    selected = set(stages or STAGE_NAMES)
+    unknown = selected - set(STAGE_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}")
+    for name, func in STAGES:
+        if name not in selected:
+            continue
+        if df is None and name != "ingest":
+            raise ValueError(f"Stage '{name}' needs input; run ingest first or pass a DataFrame")
+        df = profiler.run(name, func, df, args) if profiler else func(df, args)
+    return df
+
+
+def read_stage_frame(path):
+    return pd.read_pickle(path) if path.endswith(".pkl") else pd.read_csv(path)
+
+
+def write_stage_frame(df, path):
+    if path.endswith(".pkl"):
+        df.to_pickle(path)
+    else:
+        df.to_csv(path, index=False)
+
+
+def parse_args(argv=None):
+    """Parse command-line options; parse_args([]) gives the defaults for use from Python"""
+    parser = argparse.ArgumentParser(description="Clean, validate and categorize the tools workbook")
+    parser.add_argument("--source", help="workbook to process (default: first one in . or data/)")
+    parser.add_argument("--sheet", default=SHEET_NAME, help="sheet to read (default: first sheet)")
+    parser.add_argument("--no-workbook-cache", action="store_true",
+                        help="parse the workbook even if a cached copy is up to date")
+    parser.add_argument("--refresh-urls", action="store_true",
+                        help="recheck every URL instead of using cached statuses")
+    parser.add_argument("--cache-ttl", type=float, default=URL_CACHE_TTL,
+                        help="seconds a cached URL status stays valid (default: %(default)s)")
+    parser.add_argument("--url-cache", default=URL_CACHE_FILE,
+                        help="URL status cache file (default: %(default)s)")
+    parser.add_argument("--no-url-cache", action="store_true", help="do not read or write the URL cache")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only process rows that changed since the last incremental run")
+    parser.add_argument("--manifest", default=MANIFEST_FILE,
+                        help="row manifest used by --incremental (default: %(default)s)")
+    parser.add_argument("--batch", nargs="*", metavar="DIR",
+                        help="process every workbook in the given directories (default: . and data/)")
+    parser.add_argument("--batch-output", default=BATCH_OUTPUT_DIR,
+                        help="directory for batch results (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes for batch mode (default: one per CPU)")
+    parser.add_argument("--chunk-rows", type=int, default=0,
+                        help="process the sheet in chunks of this many rows to bound memory use")
+    parser.add_argument("--stage", action="append", choices=STAGE_NAMES,
+                        help="run only this stage; repeat to run several, always in pipeline order")
+    parser.add_argument("--stage-input", help="DataFrame (.pkl or .csv) fed to the first selected stage")
+    parser.add_argument("--stage-output", help="save the last selected stage's DataFrame (.pkl or .csv)")
+    parser.add_argument("--profile", action="store_true",
+                        help="print wall time, rows in/out and memory delta for each stage")
+    parser.add_argument("--profile-dump", metavar="FILE", help="also write cProfile statistics to FILE")
+    args = parser.parse_args(argv)
+    args.source = args.source or find_excel_file() or DEFAULT_SOURCE_FILE
+    if sum(map(bool, (args.incremental, args.chunk_rows, args.batch is not None))) > 1:
+        parser.error("--incremental, --chunk-rows and --batch cannot be combined")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.batch is not None:
+        paths = find_excel_files(args.batch or ('.', 'data'))
+        if not paths:
+            print(" Error: No Excel workbooks found!")
+            exit(1)
+        run_batch(paths, args)
+        report_peak_memory()
+        return
+
+    needs_source = args.chunk_rows or args.incremental or not args.stage or "ingest" in args.stage
+    # Check if source file exists
+    if needs_source and not os.path.exists(args.source):
+        print(f" Error: Source file '{args.source}' not found!")
+        print(" Current directory contents:")
+        for file in os.listdir('.'):
+            if file.endswith(('.xlsx', '.xls', '.csv')):
+                print(f" - {file}")
+        exit(1)
+
+    try:
+        if args.chunk_rows:
+            run_chunked(args.source, args)
+            finish()
+            return
+
+        if args.incremental:
+            df = run_pipeline(args, ["ingest", "normalize", "fix-typos"])
+            if run_incremental(df, args):
+                finish()
+            else:
+                report_peak_memory()
+            return
+
+        profiler = StageProfiler() if args.profile or args.profile_dump else None
+        df = read_stage_frame(args.stage_input) if args.stage_input else None
+        profile = cProfile.Profile() if args.profile_dump else None
+        if profile:
+            profile.enable()
+        try:
+            df = run_pipeline(args, args.stage, df, profiler)
+        finally:
+            if profile:
+                profile.disable()
+                profile.dump_stats(args.profile_dump)
+    except MissingColumnsError as e:
+        print(f" {e}")
+        exit(1)
+    except Exception as e:
+        print(" Failed to process workbook:", e)
+        exit(1)
+
+    if args.stage_output:
+        write_stage_frame(df, args.stage_output)
+        print(f" Stage output saved to: {args.stage_output}")
+    if profiler:
+        profiler.report()
+    if args.profile_dump:
+        print(f" cProfile statistics saved to: {args.profile_dump}")
+    if not args.stage or "export" in args.stage:
+        finish()
+    else:
+        report_peak_memory()
+
+
+def finish():
+    print(f" Cleanup complete!\n- Saved cleaned tools to: {CLEANED_CSV}\n- Summary saved to: {SUMMARY_CSV}")
+    report_peak_memory()
+
+
+def report_peak_memory():
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f" Peak memory (RSS): {peak:.1f} MB")
 
-# Cleanup temp file
-os.remove(TEMP_CSV)
 
-print(f" Cleanup complete!\n- Saved cleaned tools to: {CLEANED_CSV}\n- Summary saved to: {SUMMARY_CSV}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+../../python/Podman_Image_Cleanup.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../python/Podman_Image_Usage.py
\ No newline at end of file